@@ -0,0 +1,195 @@
+"""Throughput, latency and memory benchmarks for the engine's hot paths.
+
+Each stage runs over a synthetic catalog (see ``synthetic.py``) with the
+result cache disabled, so every listing is computed cold:
+
+* ``detect_category``, ``extract_keywords`` and ``optimize_listing`` are timed
+  per listing;
+* ``bulk`` (``process_chunk``, all tones) and ``export`` (JSONL) are timed
+  per chunk.
+
+For each stage it reports listings/sec, p50/p99 latency and peak traced
+memory. The fastest of ``--repeat`` timed passes is kept, and memory comes
+from a separate ``tracemalloc``-instrumented pass so tracing overhead does
+not skew the timings. ``--save`` stores the numbers as a baseline;
+``--compare`` checks a run against one and exits non-zero on regressions.
+
+    python benchmarks/hotpaths.py --rows 1k --compare benchmarks/baseline.json
+    python benchmarks/hotpaths.py --rows 100k --shape titles --save /tmp/baseline.json
+"""
+
+# --- Imports ---
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from sellspark import cache  # noqa: E402
+from sellspark.engine import detect_category, extract_keywords, optimize_listing, process_chunk  # noqa: E402
+from sellspark.export import ExportWriter  # noqa: E402
+from sellspark.feeds import CHUNK_SIZE, chunked  # noqa: E402
+from synthetic import PRESETS, SHAPES, generate  # noqa: E402
+
+STAGES = ("detect_category", "extract_keywords", "optimize_listing", "bulk", "export")
+DEFAULT_TOLERANCE = 0.25
+DEFAULT_REPEAT = 3
+
+
+# --- Stages ---
+def _stage_items(stage, listings, chunk_size):
+    """Return ``(work items, listings per item, callable)`` for a stage."""
+    if stage == "detect_category":
+        return listings, 1, detect_category
+    if stage == "extract_keywords":
+        return listings, 1, extract_keywords
+    if stage == "optimize_listing":
+        pairs = [(listing, detect_category(listing)) for listing in listings]
+        return pairs, 1, lambda pair: optimize_listing(pair[0], "Persuasive", pair[1])
+    chunks = list(chunked(listings, chunk_size))
+    if stage == "bulk":
+        return chunks, chunk_size, process_chunk
+    if stage == "export":
+        results = [process_chunk(chunk) for chunk in chunks]
+        return results, chunk_size, ExportWriter("jsonl", os.devnull).write
+    raise ValueError(f"Unknown stage '{stage}'")
+
+
+def _percentile(sorted_values, q):
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+def _timed_pass(items, fn):
+    latencies = []
+    gc.collect()
+    clock = time.perf_counter
+    started = clock()
+    for item in items:
+        t = clock()
+        fn(item)
+        latencies.append(clock() - t)
+    return clock() - started, latencies
+
+
+def run_stage(stage, listings, chunk_size=CHUNK_SIZE, memory=True, repeat=DEFAULT_REPEAT):
+    """Time ``repeat`` passes of a stage and keep the fastest, then trace memory once."""
+    items, per_item, fn = _stage_items(stage, listings, chunk_size)
+    elapsed, latencies = min((_timed_pass(items, fn) for _ in range(repeat)), key=lambda run: run[0])
+
+    peak_mb = None
+    if memory:
+        gc.collect()
+        tracemalloc.start()
+        for item in items:
+            fn(item)
+        peak_mb = round(tracemalloc.get_traced_memory()[1] / 2**20, 2)
+        tracemalloc.stop()
+
+    latencies.sort()
+    return {
+        "listings_per_sec": round(len(listings) / elapsed, 1) if elapsed else 0.0,
+        "latency_unit": "listing" if per_item == 1 else f"chunk of {per_item}",
+        "p50_ms": round(_percentile(latencies, 0.50) * 1000, 4),
+        "p99_ms": round(_percentile(latencies, 0.99) * 1000, 4),
+        "peak_mb": peak_mb,
+    }
+
+
+def run(shapes, rows, stages, chunk_size=CHUNK_SIZE, memory=True, repeat=DEFAULT_REPEAT):
+    """Run every stage over every shape; returns ``{"shape-rows": {stage: metrics}}``."""
+    cache.configure(maxsize=0)  # measure cold work, not cache hits
+    report = {}
+    for shape in shapes:
+        listings = list(generate(shape, rows))
+        key = f"{shape}-{rows}"
+        report[key] = {}
+        for stage in stages:
+            metrics = run_stage(stage, listings, chunk_size, memory, repeat)
+            report[key][stage] = metrics
+            peak = f"{metrics['peak_mb']:>8.2f} MB" if metrics["peak_mb"] is not None else "       —"
+            print(
+                f"{key:<20} {stage:<17} {metrics['listings_per_sec']:>11,.0f}/s  "
+                f"p50 {metrics['p50_ms']:>9.3f} ms  p99 {metrics['p99_ms']:>9.3f} ms  "
+                f"peak {peak}  (per {metrics['latency_unit']})"
+            )
+    return report
+
+
+# --- Baselines ---
+def compare(report, baseline, tolerance=DEFAULT_TOLERANCE):
+    """Return human-readable regressions of ``report`` against ``baseline``."""
+    regressions = []
+    for key, stages in report.items():
+        for stage, metrics in stages.items():
+            base = baseline.get(key, {}).get(stage)
+            if not base:
+                continue
+            if metrics["listings_per_sec"] < base["listings_per_sec"] * (1 - tolerance):
+                regressions.append(
+                    f"{key} {stage}: throughput {metrics['listings_per_sec']:,.0f}/s "
+                    f"vs baseline {base['listings_per_sec']:,.0f}/s"
+                )
+            if metrics["p99_ms"] > base["p99_ms"] * (1 + tolerance):
+                regressions.append(
+                    f"{key} {stage}: p99 {metrics['p99_ms']:.3f} ms vs baseline {base['p99_ms']:.3f} ms"
+                )
+            if metrics["peak_mb"] and base.get("peak_mb") and metrics["peak_mb"] > base["peak_mb"] * (1 + tolerance):
+                regressions.append(
+                    f"{key} {stage}: peak memory {metrics['peak_mb']:.2f} MB vs baseline {base['peak_mb']:.2f} MB"
+                )
+    return regressions
+
+
+def load_baseline(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_baseline(path, report):
+    """Merge ``report`` into the baseline file at ``path``."""
+    doc = load_baseline(path) if os.path.exists(path) else {}
+    doc["python"] = platform.python_version()
+    doc["machine"] = platform.machine()
+    doc.setdefault("runs", {}).update(report)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(doc, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--shape", choices=SHAPES, action="append", help="Catalog shape (default: all)")
+    parser.add_argument("--rows", default="1k", help=f"Row count or preset ({', '.join(PRESETS)})")
+    parser.add_argument("--stage", choices=STAGES, action="append", help="Stage to run (default: all)")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="Timed passes per stage; the fastest is kept")
+    parser.add_argument("--no-memory", action="store_true", help="Skip the tracemalloc pass")
+    parser.add_argument("--save", metavar="PATH", help="Store the results as a baseline")
+    parser.add_argument("--compare", metavar="PATH", help="Flag regressions against a stored baseline")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="Allowed relative slowdown / growth before flagging (default 0.25)")
+    args = parser.parse_args(argv)
+
+    rows = PRESETS.get(args.rows.lower()) or int(args.rows)
+    report = run(args.shape or SHAPES, rows, args.stage or STAGES, args.chunk_size, not args.no_memory, args.repeat)
+    if args.save:
+        save_baseline(args.save, report)
+        print(f"💾 Baseline saved to {args.save}")
+    if args.compare:
+        regressions = compare(report, load_baseline(args.compare).get("runs", {}), args.tolerance)
+        for regression in regressions:
+            print(f"❌ {regression}")
+        if regressions:
+            return 1
+        print("✅ no regressions against baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,59 @@
+"""Cold-start benchmark for the template (Fast) path.
+
+Spawns fresh interpreters that import the engine and optimize one listing,
+then reports the wall time per start. Exits non-zero when the median exceeds
+``--max-seconds`` or when torch was imported along the way.
+
+    python benchmarks/startup.py --runs 10 --max-seconds 1.0
+"""
+
+# --- Imports ---
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = (
+    "import sys\n"
+    "from sellspark import detect_category, optimize_listing\n"
+    "text = 'Stainless steel water bottle 1L'\n"
+    "optimize_listing(text, 'Persuasive', detect_category(text))\n"
+    "sys.exit(3 if 'torch' in sys.modules else 0)\n"
+)
+
+
+def run_once():
+    start = time.perf_counter()
+    proc = subprocess.run([sys.executable, "-c", PROBE], cwd=ROOT)
+    elapsed = time.perf_counter() - start
+    if proc.returncode == 3:
+        raise SystemExit("❌ torch was imported on the template path")
+    if proc.returncode:
+        raise SystemExit(f"❌ probe failed with exit code {proc.returncode}")
+    return elapsed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--max-seconds", type=float, default=1.0)
+    args = parser.parse_args(argv)
+
+    timings = [run_once() for _ in range(args.runs)]
+    median = statistics.median(timings)
+    print(f"cold start: median {median * 1000:.1f} ms, "
+          f"min {min(timings) * 1000:.1f} ms, max {max(timings) * 1000:.1f} ms "
+          f"over {args.runs} runs")
+    if median > args.max_seconds:
+        print(f"❌ median exceeds {args.max_seconds:.2f} s budget")
+        return 1
+    print("✅ within budget")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
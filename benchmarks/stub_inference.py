@@ -0,0 +1,90 @@
+"""Stub text-generation server for exercising the Premium rewrite backend locally.
+
+Answers ``POST`` requests shaped like the Hugging Face Inference API with a
+canned rewrite per input, after an optional delay; ``--fail-rate`` makes some
+requests return HTTP 500 so the template fallback can be checked.
+
+    python benchmarks/stub_inference.py --port 8765 --delay 0.05
+    SELLSPARK_REWRITE_URL=http://127.0.0.1:8765 python -m sellspark listings.txt --mode Premium
+"""
+
+# --- Imports ---
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    delay = 0.0
+    fail_rate = 0.0
+    stats = {"requests": 0, "inputs": 0, "max_batch": 0}
+    lock = threading.Lock()
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        inputs = body.get("inputs") or []
+        if isinstance(inputs, str):
+            inputs = [inputs]
+        with self.lock:
+            self.stats["requests"] += 1
+            self.stats["inputs"] += len(inputs)
+            self.stats["max_batch"] = max(self.stats["max_batch"], len(inputs))
+        time.sleep(self.delay)
+        if random.random() < self.fail_rate:
+            self._reply(500, {"error": "stub failure"})
+            return
+        outputs = [{"generated_text": f"[stub] {_listing(prompt)}"} for prompt in inputs]
+        self._reply(200, outputs)
+
+    def _reply(self, status, payload):
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+def _listing(prompt):
+    for line in prompt.splitlines():
+        if line.startswith("Listing: "):
+            return line[len("Listing: "):]
+    return prompt
+
+
+def serve(host="127.0.0.1", port=8765, delay=0.0, fail_rate=0.0):
+    """Start the stub in a background thread and return the server."""
+    handler = type("Handler", (StubHandler,), {
+        "delay": delay, "fail_rate": fail_rate,
+        "stats": {"requests": 0, "inputs": 0, "max_batch": 0},
+    })
+    server = ThreadingHTTPServer((host, port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--delay", type=float, default=0.0, help="Seconds to sleep per request")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="Fraction of requests answered with HTTP 500")
+    args = parser.parse_args(argv)
+    server = serve(args.host, args.port, args.delay, args.fail_rate)
+    print(f"Stub inference server on http://{args.host}:{server.server_port}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+        print(f"Served {server.RequestHandlerClass.stats}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Synthetic catalog generators for the benchmarks.
+
+Listings are built from the shipped category keywords plus brand, adjective
+and filler vocabulary, seeded so every run sees the same catalog. Two shapes
+are provided: short marketplace titles and long multi-sentence descriptions.
+
+    python benchmarks/synthetic.py --shape titles --rows 100000 > titles.txt
+"""
+
+# --- Imports ---
+import argparse
+import json
+import os
+import random
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TEMPLATES = os.path.join(ROOT, "sellspark", "data", "templates.json")
+
+SHAPES = ("titles", "descriptions")
+PRESETS = {"1k": 1_000, "100k": 100_000, "1m": 1_000_000}
+
+BRANDS = ["Acme", "Nimbus", "Orbit", "Zenith", "Bolt", "Lumen", "Kora", "Vista", "Pioneer", "Maple"]
+ADJECTIVES = [
+    "premium", "lightweight", "durable", "compact", "wireless", "organic", "stainless",
+    "handmade", "portable", "waterproof", "classic", "modern", "ergonomic", "eco-friendly",
+]
+MATERIALS = ["cotton", "steel", "leather", "bamboo", "silicone", "glass", "wool", "aluminium"]
+FILLER = (
+    "designed for everyday use with a focus on comfort and reliability. "
+    "Easy to clean, built to last and backed by our satisfaction guarantee. "
+    "Perfect as a gift for friends and family on any occasion. "
+    "Ships quickly in recyclable packaging from our local warehouse. "
+).split(". ")
+
+
+def _keywords():
+    with open(TEMPLATES, encoding="utf-8") as f:
+        table = json.load(f)["category_keywords"]
+    return [keyword for keywords in table.values() for keyword in keywords]
+
+
+def generate(shape="titles", rows=1_000, seed=42):
+    """Yield ``rows`` synthetic listings of the given shape."""
+    if shape not in SHAPES:
+        raise ValueError(f"Unknown shape '{shape}'; choose from {', '.join(SHAPES)}")
+    rng = random.Random(seed)
+    keywords = _keywords()
+    for i in range(rows):
+        brand = rng.choice(BRANDS)
+        title = (
+            f"{brand} {rng.choice(ADJECTIVES)} {rng.choice(MATERIALS)} "
+            f"{rng.choice(keywords)} {rng.randint(1, 999)}"
+        )
+        if shape == "titles":
+            yield title
+            continue
+        sentences = [f"{title} by {brand}"]
+        for _ in range(rng.randint(3, 8)):
+            sentences.append(
+                f"The {rng.choice(ADJECTIVES)} {rng.choice(keywords)} is {rng.choice(FILLER).strip()}"
+            )
+        yield ". ".join(sentences) + "."
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--shape", choices=SHAPES, default="titles")
+    parser.add_argument("--rows", default="1k", help=f"Row count or preset ({', '.join(PRESETS)})")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args(argv)
+    rows = PRESETS.get(args.rows.lower()) or int(args.rows)
+    for listing in generate(args.shape, rows, args.seed):
+        sys.stdout.write(listing + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
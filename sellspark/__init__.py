@@ -0,0 +1,29 @@
+"""SellSpark listing engine, usable without the Streamlit UI."""
+
+from .engine import (
+    TONES,
+    MatchTrace,
+    classify,
+    classify_many,
+    detect_category,
+    extract_keywords,
+    extract_main_keyword,
+    generate_all_tones,
+    optimize_batch,
+    optimize_listing,
+    pipeline_version,
+    process_chunk,
+    process_listing,
+    rank_keywords,
+    render_many,
+)
+from .cache import ListingCache, get_cache
+from .dedupe import VariantClusterer
+from .feeds import chunked, detect_format, iter_listings
+from .keywords import KeywordIndex, TokenBatch, set_keyword_index, tokenize
+from .metrics import render_metrics, serve_metrics, write_metrics
+from .models import LocalRewriter
+from .parallel import optimize_parallel
+from .registry import TemplateRegistry, get_registry, reload_registry
+from .rewrite import HttpRewriter, get_rewriter, set_rewriter
+from .server import make_server
@@ -0,0 +1,195 @@
+"""Bounded LRU memo cache for per-listing engine results.
+
+Keys combine a hash of the whitespace/Unicode-normalized listing with the
+call's other inputs (tone, category, mode) and the template registry version,
+so a template reload never serves stale copy. Duplicate catalog lines and
+re-clicked batches are answered from memory; an optional SQLite file keeps
+entries across restarts (set ``SELLSPARK_CACHE_PATH`` or call ``configure``).
+The file is bounded too: once it holds more than ``max_rows`` entries the
+oldest-written are deleted, which also retires keys from old template,
+keyword-index or backend versions.
+"""
+
+# --- Imports ---
+import hashlib
+import os
+import pickle
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+
+DEFAULT_MAXSIZE = 50_000
+DEFAULT_MAX_ROWS = 200_000  # disk entries kept (about 1.5 KB each with all five tones)
+PRUNE_TO = 0.9  # fraction of max_rows left after pruning, so it doesn't run every flush
+FLUSH_EVERY = 256  # pending disk writes before an automatic flush
+
+_WHITESPACE = re.compile(r"\s+")
+_MISSING = object()
+
+
+def normalize_listing(text):
+    """Collapse whitespace and apply NFC so trivially different lines share a key."""
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFC", text)).strip()
+
+
+def listing_digest(text):
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class ListingCache:
+    """Thread-safe LRU cache with hit/miss counters and optional SQLite backing."""
+
+    def __init__(self, maxsize=DEFAULT_MAXSIZE, path=None, max_rows=DEFAULT_MAX_ROWS):
+        self.maxsize = maxsize
+        self.path = path
+        self.max_rows = max_rows
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._pending = []
+        self._lock = threading.Lock()
+        self._db = None
+        if path:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value BLOB, created REAL NOT NULL DEFAULT 0)"
+            )
+            columns = {row[1] for row in self._db.execute("PRAGMA table_info(cache)")}
+            if "created" not in columns:  # a file from before entries were dated
+                self._db.execute("ALTER TABLE cache ADD COLUMN created REAL NOT NULL DEFAULT 0")
+            self._db.execute("CREATE INDEX IF NOT EXISTS cache_created ON cache (created)")
+            self._rows = self._db.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+
+    def _disk_get(self, key):
+        row = self._db.execute("SELECT value FROM cache WHERE key = ?", (repr(key),)).fetchone()
+        return pickle.loads(row[0]) if row else None
+
+    def get(self, key, default=None):
+        """Return the cached value for ``key`` (counting a hit or miss), else ``default``."""
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            value = self._disk_get(key) if self._db is not None else None
+            if value is not None:
+                self.hits += 1
+                self._remember(key, value)
+                return value
+            self.misses += 1
+        return default
+
+    def put(self, key, value):
+        with self._lock:
+            self._remember(key, value)
+            if self._db is not None:
+                self._pending.append((repr(key), pickle.dumps(value), time.time()))
+                if len(self._pending) >= FLUSH_EVERY:
+                    self._flush()
+
+    def get_or_compute(self, key, compute):
+        """Return the cached value for ``key``, computing and storing it on a miss."""
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def _remember(self, key, value):
+        self._data[key] = value
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def _flush(self):
+        if self._pending:
+            with self._db:
+                self._db.executemany("INSERT OR REPLACE INTO cache VALUES (?, ?, ?)", self._pending)
+            self._rows += len(self._pending)  # replaced keys overcount; _prune recounts
+            self._pending = []
+            if self._rows > self.max_rows:
+                self._prune()
+
+    def _prune(self):
+        """Delete the oldest disk entries, leaving ``PRUNE_TO`` of ``max_rows``."""
+        self._rows = self._db.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+        if self._rows <= self.max_rows:
+            return
+        excess = self._rows - int(self.max_rows * PRUNE_TO)
+        with self._db:
+            self._db.execute(
+                "DELETE FROM cache WHERE key IN (SELECT key FROM cache ORDER BY created LIMIT ?)", (excess,)
+            )
+        self._rows -= excess
+
+    def flush(self):
+        """Write pending entries to disk (no-op without a ``path``)."""
+        with self._lock:
+            if self._db is not None:
+                self._flush()
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._pending = []
+            self.hits = self.misses = 0
+            if self._db is not None:
+                with self._db:
+                    self._db.execute("DELETE FROM cache")
+                self._rows = 0
+
+    def close(self):
+        self.flush()
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+# --- Shared instance ---
+_cache = None
+_inherited = None
+
+
+def get_cache():
+    """Return the process-wide cache, creating it from the environment on first use."""
+    global _cache
+    if _cache is None:
+        _cache = ListingCache(path=os.environ.get("SELLSPARK_CACHE_PATH") or None)
+    return _cache
+
+
+def reopen():
+    """Give a forked worker its own cache with a fresh SQLite connection.
+
+    SQLite connections must not be used across ``fork``, so the inherited cache
+    is set aside without being flushed or closed (its pending writes belong to
+    the parent) and a new one is opened on the same file. A memory-only cache
+    is kept as inherited.
+    """
+    global _cache, _inherited
+    if _cache is not None and _cache.path:
+        _inherited = _cache  # kept referenced so its connection is never finalized here
+        _cache = ListingCache(_cache.maxsize, _cache.path, _cache.max_rows)
+    return _cache
+
+
+def configure(maxsize=DEFAULT_MAXSIZE, path=None, max_rows=DEFAULT_MAX_ROWS):
+    """Replace the process-wide cache (e.g. to enable disk persistence)."""
+    global _cache
+    if _cache is not None:
+        _cache.close()
+    _cache = ListingCache(maxsize, path, max_rows)
+    return _cache
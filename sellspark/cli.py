@@ -0,0 +1,193 @@
+"""``sellspark`` command line: optimize a file of listings without Streamlit.
+
+Usage::
+
+    python -m sellspark listings.txt -o results.jsonl
+
+The input is plain text (one listing per line, ``-`` reads stdin), a CSV export
+or a JSON Lines export; the format follows the file extension unless
+``--format`` is given. Listings are streamed through the engine in chunks and
+written as JSON Lines, one object per listing, as each chunk completes.
+``--build-index index.json`` counts document frequencies over the input
+instead, and ``--keyword-index index.json`` ranks keywords with them.
+``--mode Premium --rewrite-url URL`` rewrites copy with a hosted model
+(``HF_TOKEN`` is sent as the bearer token), keeping template copy on failure;
+``--local-model NAME`` runs a quantized seq2seq model on CPU instead.
+``--dedupe`` groups near-duplicate variants (colour, size, pack count) so
+each family is classified (and, in Premium mode, rewritten) once.
+``--metrics-file PATH`` writes per-stage timings, chunk sizes and cache
+figures in the Prometheus text format when the run finishes.
+``--export csv|jsonl|xlsx`` writes the flat one-row-per-listing×tone export
+used by the web app instead.
+
+``python -m sellspark --serve 8000`` runs the batch HTTP API instead (see
+``sellspark.server``).
+
+``python -m sellspark --validate`` checks the templates file instead and exits
+non-zero if any category would fall back to the default template or a
+template uses a field other than ``{keyword}``.
+"""
+
+# --- Imports ---
+import argparse
+import os
+import sys
+
+from . import cache
+from .dedupe import DEFAULT_THRESHOLD, VariantClusterer
+from .engine import TONES, optimize_batch
+from .export import EXPORT_FORMATS, ExportWriter, xlsx_available
+from .feeds import CHUNK_SIZE, FORMATS, detect_format, iter_listings, write_jsonl
+from .keywords import KeywordIndex, set_keyword_index
+from .parallel import optimize_parallel
+from .metrics import write_metrics
+from .models import LocalRewriter
+from .registry import get_registry
+from .rewrite import HttpRewriter, set_rewriter
+from .server import serve
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="sellspark",
+        description="Optimize product listings in bulk from a text, CSV or JSONL feed.",
+    )
+    parser.add_argument("input", nargs="?", help="Listings feed (.txt, .csv or .jsonl; '-' for stdin)")
+    parser.add_argument("-o", "--output", default="-", help="JSONL output file ('-' for stdout)")
+    parser.add_argument("--format", choices=FORMATS, help="Input format (default: from extension)")
+    parser.add_argument("--column", help="CSV column / JSON field holding the listing text")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="Listings per chunk")
+    parser.add_argument("--export", choices=EXPORT_FORMATS, help="Write a flat listing×tone export (needs -o)")
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes (0 = one per CPU)")
+    parser.add_argument("--build-index", metavar="PATH", help="Build a TF-IDF keyword index from the input and exit")
+    parser.add_argument("--keyword-index", metavar="PATH", help="Rank keywords with this catalog index")
+    parser.add_argument("--cache", metavar="PATH", help="Persist the result cache in this SQLite file")
+    parser.add_argument("--tones", type=_tone_list, help=f"Comma-separated tones to render (default: all of {', '.join(TONES)})")
+    parser.add_argument("--dedupe", action="store_true", help="Classify and rewrite each near-duplicate variant family once")
+    parser.add_argument("--dedupe-threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Shingle similarity for joining a variant family (default 0.8)")
+    parser.add_argument("--mode", default="Fast", choices=["Fast", "Premium"], help="Rewrite mode")
+    parser.add_argument("--rewrite-url", metavar="URL", help="Text-generation endpoint for Premium rewrites")
+    parser.add_argument("--rewrite-concurrency", type=int, default=4, help="Rewrite batches in flight")
+    parser.add_argument("--rewrite-timeout", type=float, default=10.0, help="Seconds before a rewrite (hosted batch or local call) falls back")
+    parser.add_argument("--local-model", metavar="NAME", help="Local seq2seq model for Premium rewrites (needs torch)")
+    parser.add_argument("--max-latency", type=float, default=0.05, help="Seconds a local rewrite waits for its batch to fill")
+    parser.add_argument("--metrics-file", metavar="PATH", help="Write Prometheus-format run metrics here")
+    parser.add_argument("--serve", type=int, metavar="PORT", help="Run the batch HTTP API on this port")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface for --serve (default: localhost)")
+    parser.add_argument("--validate", action="store_true", help="Check the templates file and exit")
+    return parser
+
+
+def _tone_list(value):
+    tones = [tone.strip() for tone in value.split(",") if tone.strip()]
+    unknown = [tone for tone in tones if tone not in TONES]
+    if unknown or not tones:
+        raise argparse.ArgumentTypeError(f"unknown tone(s): {', '.join(unknown) or value!r}")
+    return tones
+
+
+def _open(path, mode):
+    if path == "-":
+        return sys.stdin if "r" in mode else sys.stdout
+    encoding = "utf-8-sig" if "r" in mode else "utf-8"
+    return open(path, mode, encoding=encoding, newline="")
+
+
+def validate():
+    try:
+        registry = get_registry()
+    except ValueError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 1
+    problems = registry.validate()
+    for problem in problems:
+        print(f"⚠️ {problem}", file=sys.stderr)
+    if problems:
+        return 1
+    print(f"✅ Templates {registry.version}: {len(registry.templates)} categories OK", file=sys.stderr)
+    return 0
+
+
+def build_index(args):
+    src = _open(args.input, "r")
+    try:
+        index = KeywordIndex.build(iter_listings(src, args.format or detect_format(args.input), args.column))
+    finally:
+        if src is not sys.stdin:
+            src.close()
+    index.save(args.build_index)
+    print(f"✅ Indexed {index.n_docs} listings, {len(index.df)} terms → {args.build_index}", file=sys.stderr)
+    return 0
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.validate:
+        return validate()
+    if args.input is None and args.serve is None:
+        parser.error("an input file is required unless --validate or --serve is given")
+    if args.export and args.output == "-":
+        parser.error("--export needs an output file (-o)")
+    if args.export == "xlsx" and not xlsx_available():
+        parser.error("XLSX export needs openpyxl; install it or choose csv/jsonl")
+    if args.build_index:
+        return build_index(args)
+    if args.keyword_index:
+        # Exported too so spawned worker processes load the same index.
+        os.environ["SELLSPARK_KEYWORD_INDEX"] = args.keyword_index
+        set_keyword_index(KeywordIndex.load(args.keyword_index))
+    if args.cache:
+        cache.configure(path=args.cache)
+    if args.rewrite_url and args.local_model:
+        parser.error("choose either --rewrite-url or --local-model")
+    if args.local_model:
+        os.environ["SELLSPARK_LOCAL_MODEL"] = args.local_model
+        set_rewriter(LocalRewriter(args.local_model, max_latency=args.max_latency, timeout=args.rewrite_timeout))
+    if args.rewrite_url:
+        os.environ["SELLSPARK_REWRITE_URL"] = args.rewrite_url
+        set_rewriter(HttpRewriter(
+            args.rewrite_url,
+            token=os.environ.get("HF_TOKEN"),
+            concurrency=args.rewrite_concurrency,
+            timeout=args.rewrite_timeout,
+        ))
+    if args.serve is not None:
+        return serve(args.serve, args.host)
+    src = _open(args.input, "r")
+    fmt = args.format or detect_format(args.input)
+    try:
+        listings = iter_listings(src, fmt, args.column)
+        if args.workers == 1:
+            dedupe = VariantClusterer(args.dedupe_threshold) if args.dedupe else False
+            results = optimize_batch(
+                listings, args.mode, chunk_size=args.chunk_size, tones=args.tones, dedupe=dedupe
+            )
+        else:
+            results = optimize_parallel(
+                listings, args.mode, args.workers or None, args.chunk_size, args.tones,
+                args.dedupe, args.dedupe_threshold,
+            )
+        if args.export:
+            with ExportWriter(args.export, args.output) as writer:
+                count = writer.write(results)
+        else:
+            dst = _open(args.output, "w")
+            try:
+                count = write_jsonl(results, dst)
+            finally:
+                if dst is not sys.stdout:
+                    dst.close()
+    finally:
+        if src is not sys.stdin:
+            src.close()
+        cache.get_cache().flush()
+        if args.metrics_file:
+            write_metrics(args.metrics_file)
+    message = f"✅ Optimized {count} listings"
+    if args.workers == 1:
+        stats = cache.get_cache().stats()
+        message += f" (cache hits {stats['hits']}, misses {stats['misses']})"
+    print(message, file=sys.stderr)
+    return 0
@@ -0,0 +1,241 @@
+"""Near-duplicate grouping of listings that differ only by variant details.
+
+Catalogs list the same product many times over: another colour, size, pack
+count or capacity. ``VariantClusterer`` maps each listing to a *family*:
+
+1. the listing is reduced to a canonical form with colour, size, unit,
+   number and pack words removed, and families with an identical canonical
+   form are found with one dict lookup;
+2. new canonical forms are MinHashed (word unigrams and bigrams) and looked
+   up in an LSH index (``bands`` × ``rows`` signature), and candidates whose
+   shingle Jaccard similarity reaches ``threshold`` *and* whose category
+   keyword hits are identical join that family.
+
+The canonical form keeps every category keyword word and marks removed words
+and punctuation between words with a ``_`` gap, so the keyword matcher scores
+it exactly as it scores the listing itself. Listings sharing a canonical form
+therefore classify identically, and the keyword check in step 2 stops a
+near-duplicate that differs in one category word ("leash" vs "laptop") from
+inheriting the wrong category.
+
+The engine classifies and (in Premium mode) rewrites one representative per
+family; the other variants reuse its category, and its rewrite with their own
+keyword substituted for the representative's. Template copy and SEO keywords
+are rendered from each variant's own keyword. A clusterer is incremental, so one
+instance can span every chunk of a feed. MinHashing costs more than
+classifying a short title, so when LSH has merged almost nothing after
+``LSH_PROBE`` new forms (a catalog of mostly unique products) the clusterer
+keeps to exact canonical matches. Shingles are hashed with blake2b, so
+families don't depend on ``PYTHONHASHSEED`` and are the same in every process.
+"""
+
+# --- Imports ---
+import random
+import re
+from hashlib import blake2b
+
+from .registry import get_registry
+
+DEFAULT_THRESHOLD = 0.8
+BANDS = 4
+ROWS = 4
+MAX_FAMILIES = 200_000
+BUCKET_SIZE = 8  # families kept per LSH bucket; bounds the candidates checked per listing
+LSH_PROBE = 2_000  # new canonical forms seen before judging whether LSH pays off
+LSH_MIN_MERGES = 0.02  # below this merge rate, fall back to exact canonical matching
+
+COLOURS = frozenset("""
+    black white red blue green yellow pink purple orange grey gray brown beige navy silver
+    gold maroon teal ivory cream olive khaki multicolor multicolour rose charcoal turquoise
+""".split())
+SIZES = frozenset("xxs xs s m l xl xxl xxxl 2xl 3xl 4xl small medium large regular".split())
+VARIANT_WORDS = frozenset("pack packs set sets pcs pc piece pieces count ct size color colour of".split())
+UNIT_RE = re.compile(
+    r"^\d+(?:\.\d+)?(?:x\d+(?:\.\d+)?)*"
+    r"(?:ml|l|ltr|litre|liter|g|gm|gms|kg|mg|oz|lb|lbs|cm|mm|m|in|inch|ft|gb|tb|mb|w|v|mah|pcs|pc|pk|x|s)?$"
+)
+# Anything the keyword matcher treats as a word boundary, other than a space
+# (a decimal point inside a number is part of the word).
+SEPARATOR_RE = re.compile(r"(?:[^\w\s.]|_|(?<![0-9])\.|\.(?![0-9]))+")
+GAP = "_"
+MAX_MEMO = 1_000_000  # remembered words before the memo is reset
+_DROP = COLOURS | SIZES | VARIANT_WORDS
+
+
+def canonical_tokens(text, drop=_DROP, keep=frozenset(), memo=None):
+    """Lowercased words of a listing with variant details (colour, size, counts) removed.
+
+    Removed words and any punctuation between two kept words become one
+    ``GAP`` token, so multi-word keywords match in the canonical form only
+    where they match in the listing. Words in ``keep`` are never removed.
+    ``memo`` (a dict reused across calls) remembers how each whitespace-separated
+    word splits and which of its pieces are kept.
+    """
+    memo = {} if memo is None else memo
+    tokens = []
+    gap = False
+    for raw in text.lower().split():
+        pieces = memo.get(raw)
+        if pieces is None:
+            pieces = memo[raw] = tuple(
+                word if word != GAP and (
+                    word in keep or not (word in drop or (word[0].isdigit() and UNIT_RE.match(word)))
+                ) else None
+                for word in SEPARATOR_RE.sub(" _ ", raw).split()
+            )
+        for word in pieces:
+            if word is None:
+                gap = True
+                continue
+            if gap and tokens:
+                tokens.append(GAP)
+            tokens.append(word)
+            gap = False
+    return tuple(tokens)
+
+
+def _same_scores(a, b):
+    # Equal hits summed in another order may differ in the last bits.
+    return all(abs(x - y) < 1e-9 for x, y in zip(a, b))
+
+
+def _stable_hash(gram):
+    return int.from_bytes(blake2b(gram.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def shingles(tokens):
+    """Word unigrams and bigrams of a canonical form."""
+    grams = set(tokens)
+    grams.update(f"{a} {b}" for a, b in zip(tokens, tokens[1:]))
+    return grams
+
+
+def jaccard(a, b):
+    if not a and not b:
+        return 1.0
+    shared = len(a & b)
+    return shared / (len(a) + len(b) - shared)
+
+
+class VariantClusterer:
+    """Incremental MinHash/LSH index assigning listings to variant families.
+
+    Variant words that are also category keywords of the current template
+    registry ("cream", "pc", "gold"), and their plurals, are kept, since they
+    decide the category. ``family_scores`` holds the matcher's category scores
+    per family while LSH is on (they're needed for the keyword check anyway);
+    ``family_ranked`` holds the representative's category ranking per family
+    once the engine has classified it, and ``family_rewrites`` its Premium
+    rewrites per ``(family, mode, tone)`` as ``(keyword, text)``.
+    """
+
+    def __init__(self, threshold=DEFAULT_THRESHOLD, bands=BANDS, rows=ROWS, seed=1, max_families=MAX_FAMILIES):
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = rows
+        self.max_families = max_families
+        rng = random.Random(seed)
+        self._masks = [rng.getrandbits(64) for _ in range(bands * rows)]
+        self.family_ranked = {}
+        self.family_scores = {}
+        self.family_rewrites = {}
+        self._versions = None
+        self._use(get_registry())
+        self.clear()
+
+    def _use(self, registry):
+        self._matcher = registry.matcher
+        words = {
+            word for keywords in registry.category_keywords.values()
+            for keyword in keywords for word in keyword.lower().split()
+        }
+        self._keep = frozenset(words | {word + suffix for word in words for suffix in ("s", "es")})
+
+    def bind(self, registry, versions):
+        """Start over if ``versions`` (templates, keyword index, backend) changed since the last call.
+
+        Family scores are indices into one matcher's categories and family
+        rewrites belong to one backend, so neither survives a hot reload.
+        """
+        if versions != self._versions:
+            self._use(registry)
+            self.clear()
+            self._versions = versions
+
+    def clear(self):
+        self._by_canonical = {}  # canonical tokens -> family id
+        self._buckets = {}       # (band, band values) -> [family ids]
+        self._shingles = []      # family id -> shingle set (None once LSH is off)
+        self.family_ranked.clear()
+        self.family_scores.clear()
+        self.family_rewrites.clear()
+        self._memo = {}
+        self._probed = self._merged = 0
+        self.lsh_enabled = True
+
+    def __len__(self):
+        return len(self._shingles)
+
+    def _signature(self, grams):
+        hashes = [_stable_hash(gram) for gram in grams] or [0]
+        return [min(map(mask.__xor__, hashes)) for mask in self._masks]
+
+    def family(self, text):
+        """Return the family id for a listing, creating a family if none is close enough.
+
+        Listings made only of variant words have nothing to compare and get ``None``.
+        """
+        if len(self._memo) > MAX_MEMO:
+            self._memo.clear()
+        tokens = canonical_tokens(text, _DROP, self._keep, self._memo)
+        if not tokens:
+            return None
+        family = self._by_canonical.get(tokens)
+        if family is not None:
+            return family
+        if len(self._shingles) >= self.max_families:
+            self.clear()  # bound memory on endless streams; families rebuild as listings arrive
+        if not self.lsh_enabled:
+            family = len(self._shingles)
+            self._shingles.append(None)
+            self._by_canonical[tokens] = family
+            return family
+        grams = shingles(tokens)
+        scores = self._matcher.score(" ".join(tokens))
+        signature = self._signature(grams)
+        rows = self.rows
+        keys = [(band, tuple(signature[band * rows:(band + 1) * rows])) for band in range(self.bands)]
+        candidates = set()
+        for key in keys:
+            candidates.update(self._buckets.get(key, ()))
+        # Jaccard can't exceed the size ratio, so only similar-sized families are compared.
+        size = len(grams)
+        low, high = size * self.threshold, size / self.threshold
+        best, best_score = None, self.threshold
+        for candidate in candidates:
+            other = self._shingles[candidate]
+            if other is None or not low <= len(other) <= high:
+                continue
+            if not _same_scores(self.family_scores[candidate], scores):
+                continue  # a category keyword differs: never share a category
+            score = jaccard(grams, other)
+            if score >= best_score:
+                best, best_score = candidate, score
+        self._probed += 1
+        if best is not None:
+            self._merged += 1
+        elif self._probed >= LSH_PROBE and self._merged < LSH_MIN_MERGES * self._probed:
+            self.lsh_enabled = False
+        if best is None:
+            best = len(self._shingles)
+            self._shingles.append(grams)
+            self.family_scores[best] = scores
+            for key in keys:
+                bucket = self._buckets.setdefault(key, [])
+                if len(bucket) < BUCKET_SIZE:
+                    bucket.append(best)
+        self._by_canonical[tokens] = best
+        return best
+
+    def assign(self, texts):
+        return [self.family(text) for text in texts]
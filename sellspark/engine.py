@@ -0,0 +1,459 @@
+"""UI-free listing engine: keyword extraction, category detection and rewriting.
+
+Everything here is importable without Streamlit so batch jobs, workers and the
+``sellspark`` CLI can share the exact logic used by the web app.
+"""
+
+# --- Imports ---
+from .cache import get_cache, listing_digest, normalize_listing
+from .dedupe import VariantClusterer
+from .feeds import CHUNK_SIZE, chunked
+from .keywords import (
+    NO_KEYWORDS,
+    TOP_KEYWORDS,
+    TokenBatch,
+    format_keywords,
+    get_keyword_index,
+    keyword_tokens,
+    main_keyword,
+    tokenize,
+)
+from .metrics import BATCH_SIZE, STAGE_LISTINGS, STAGE_SECONDS
+from .registry import get_registry
+from .rewrite import get_rewriter
+
+TONES = ["Persuasive", "Casual", "Luxury", "Urgent", "Tech-savvy"]
+FALLBACK_TAGLINE = "Smart add‑ons for everyday performance."
+
+# --- Keyword extraction ---
+def extract_main_keyword(text):
+    """Extract a main keyword candidate from the listing text."""
+    return main_keyword(tokenize(text))
+
+def extract_keywords(text):
+    """Extract all unique keywords from the listing text."""
+    return format_keywords(keyword_tokens(tokenize(text)))
+
+def rank_keywords(text, top_n=TOP_KEYWORDS):
+    """Return the listing's best keywords, ranked by TF-IDF when a catalog index is loaded."""
+    tokens = tokenize(text)
+    index = get_keyword_index()
+    if index is None:
+        return list(dict.fromkeys(keyword_tokens(tokens)))[:top_n]
+    return index.top_keywords(tokens, top_n)
+
+def _pick_keyword(tokens):
+    """Main keyword: the top TF-IDF term if an index is loaded, else the first candidate."""
+    index = get_keyword_index()
+    if index is not None:
+        best = index.top_keywords(tokens, 1)
+        if best:
+            return best[0]
+    return main_keyword(tokens)
+
+def _versions(registry):
+    """Everything besides the inputs that can change an output, for cache keys."""
+    index = get_keyword_index()
+    rewriter = get_rewriter()
+    return (
+        registry.version,
+        index.version if index is not None else None,
+        rewriter.name if rewriter is not None else None,
+    )
+
+def pipeline_version():
+    """Templates, keyword index and rewrite backend in use, as one string (for stored batch ids)."""
+    return "|".join(str(part) for part in _versions(get_registry()))
+
+# --- Optimizer using the compiled template registry ---
+def optimize_listing(text, tone, category, mode="Fast"):
+    """Render one tone for a listing, memoized on the normalized text and inputs.
+
+    A Premium draft kept because the rewrite failed is not memoized, so the
+    next call tries the backend again.
+    """
+    text = normalize_listing(text)
+    registry = get_registry()
+    key = ("optimize", listing_digest(text), tone, category, mode, _versions(registry))
+    cache = get_cache()
+    output = cache.get(key)
+    if output is None:
+        output, fallbacks = _render_listing(text, tone, category, mode, registry)
+        if not fallbacks:
+            cache.put(key, output)
+    return output
+
+def _dedupe_leading(text):
+    words = text.split()
+    if len(words) > 1 and words[0].lower() == words[1].lower():
+        return " ".join(words[1:])
+    return text
+
+def _prefix(mode):
+    return "⚡ Quick boost:" if mode.startswith("Fast") else "🌟 Premium rewrite:"
+
+def _render_listing(text, tone, category, mode, registry):
+    text = _dedupe_leading(text)
+    draft = _render(text, _pick_keyword(tokenize(text)), tone, category, mode, registry)
+    outputs, fallbacks = _polish([(text, tone, category, draft)], mode)
+    return outputs[0], fallbacks
+
+def _polish(requests, mode):
+    """Premium mode: swap ``(text, tone, category, draft)`` drafts for model rewrites.
+
+    Returns ``(outputs, fallbacks)``. Without a configured backend or outside
+    Premium mode the drafts are the answer; wherever the backend fails or times
+    out the draft is kept too, and its index is in ``fallbacks`` so callers
+    don't cache it as if it were the rewrite.
+    """
+    drafts = [draft for _, _, _, draft in requests]
+    rewriter = get_rewriter()
+    if rewriter is None or mode.startswith("Fast") or not requests:
+        return drafts, set()
+    with STAGE_SECONDS.time(stage="rewrite"):
+        outputs = rewriter.rewrite_many(requests)
+    STAGE_LISTINGS.inc(len(requests), stage="rewrite")
+    fallbacks = {i for i, output in enumerate(outputs) if output is None}
+    return [
+        f"{_prefix(mode)} {output}" if output is not None else draft
+        for output, draft in zip(outputs, drafts)
+    ], fallbacks
+
+def _render(text, keyword, tone, category, mode, registry):
+    compiled = registry.rendering(category, tone, _prefix(mode))
+    if compiled is not None:
+        return compiled.render(keyword=keyword)
+    return f"{_prefix(mode)} {text}\n\n{FALLBACK_TAGLINE}"
+
+def _render_many(keywords, category, tone, mode, registry, texts):
+    compiled = registry.rendering(category, tone, _prefix(mode))
+    if compiled is not None:
+        # Variants of one product usually share their keyword: render each once.
+        distinct = list(dict.fromkeys(keywords))
+        if len(distinct) == len(keywords):
+            return compiled.render_many(keywords)
+        rendered = dict(zip(distinct, compiled.render_many(distinct)))
+        return [rendered[keyword] for keyword in keywords]
+    return [f"{_prefix(mode)} {text}\n\n{FALLBACK_TAGLINE}" for text in texts]
+
+def render_many(keywords, category, tone, mode="Fast"):
+    """Render one tone for many keywords of the same category in one call.
+
+    Listings whose category/tone has no templates get the generic fallback
+    around the keyword itself.
+    """
+    return _render_many(keywords, category, tone, mode, get_registry(), keywords)
+
+def _output_keywords(text, keyword, category, mode, registry):
+    """Keywords of the Persuasive output, without rendering it when possible.
+
+    Template literals (prefix included) are tokenized once when the rendering
+    is compiled, so only the substituted keyword needs tokenizing here. This
+    works whether or not the Persuasive tone was requested.
+    """
+    compiled = registry.rendering(category, "Persuasive", _prefix(mode))
+    if compiled is None or not compiled.clean:
+        return extract_keywords(_render(text, keyword, "Persuasive", category, mode, registry))
+    words = list(compiled.keyword_tokens)
+    if "keyword" in compiled.fields:
+        words.extend(keyword_tokens(tokenize(keyword)))
+    return format_keywords(words)
+
+def generate_all_tones(text, category, mode="Fast", tones=None):
+    """Render every tone (or just ``tones``) for a listing; memoized as one cache entry."""
+    tones = tuple(tones or TONES)
+    text = normalize_listing(text)
+    registry = get_registry()
+    key = ("tones", listing_digest(text), category, mode, tones, _versions(registry))
+    cache = get_cache()
+    variants = cache.get(key)
+    if variants is None:
+        variants, fallbacks = _render_tones(text, category, mode, registry, tones)
+        if not fallbacks:
+            cache.put(key, variants)
+    return dict(variants)
+
+def _render_tones(text, category, mode, registry, tones):
+    text = _dedupe_leading(text)
+    keyword = _pick_keyword(tokenize(text))
+    requests = [(text, tone, category, _render(text, keyword, tone, category, mode, registry)) for tone in tones]
+    outputs, fallbacks = _polish(requests, mode)
+    return dict(zip(tones, outputs)), fallbacks
+
+# --- Category detection (matcher compiled once in the registry) ---
+def classify(text, top_k=3):
+    """Return the ``top_k`` best ``(category, score)`` pairs for a listing."""
+    text = normalize_listing(text)
+    registry = get_registry()
+    matcher = registry.matcher
+    key = ("classify", listing_digest(text), top_k, registry.version)
+    ranked = get_cache().get_or_compute(
+        key, lambda: tuple(matcher.rank(matcher.score(text), top_k))
+    )
+    return list(ranked)
+
+def classify_many(texts, top_k=3):
+    """Classify a batch of listings; returns one ranked list per listing."""
+    return [classify(text, top_k) for text in texts]
+
+class MatchTrace:
+    """Optional record of why each listing landed in its category.
+
+    Pass one to ``detect_category`` to collect one row per listing; leave it
+    out (the default) and classification does no extra work.
+    """
+
+    def __init__(self):
+        self.rows = []
+
+    def record(self, listing, category, keyword, score):
+        self.rows.append({
+            "listing": listing,
+            "category": category,
+            "keyword": keyword,
+            "score": score,
+        })
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __iter__(self):
+        return iter(self.rows)
+
+def detect_category(text, mode="Fast", trace=None):
+    """Return the highest-scoring category for the text, or "General".
+
+    When a ``MatchTrace`` is given, the keyword that triggered the match is
+    recorded on it.
+    """
+    ranked = classify(text, top_k=1)
+    category, score = ranked[0] if ranked else ("General", 0.0)
+    if trace is not None:
+        trace.record(text, category, _matched_keyword(text, category), score)
+    return category
+
+def _matched_keyword(text, category):
+    """Return the first keyword in the text that voted for ``category``."""
+    for _, keyword, matched in get_registry().matcher.finditer(text):
+        if matched == category:
+            return keyword
+    return None
+
+# --- Batch processing ---
+def _classify_families(texts, matcher, clusterer):
+    """Rank each listing by its variant family's representative (the first one seen).
+
+    Returns ``(ranked, family ids)``.
+    """
+    ranked = []
+    families = clusterer.assign(texts)
+    for text, family in zip(texts, families):
+        scores = clusterer.family_ranked.get(family) if family is not None else None
+        if scores is None:
+            # The clusterer may already have scored the family's canonical form,
+            # which scores exactly like the listing.
+            raw = clusterer.family_scores.get(family)
+            scores = matcher.rank(raw if raw is not None else matcher.score(text), 3)
+            if family is not None:
+                clusterer.family_ranked[family] = scores
+        ranked.append(scores)
+    return ranked, families
+
+def _compute_many(texts, mode, registry, tones, clusterer=None):
+    """Classify, render and extract keywords for a list of normalized listings.
+
+    Listings are tokenized in one pass, grouped by category and rendered one
+    requested tone at a time with ``render_many``. With a ``VariantClusterer``
+    only one listing per variant family is classified and Premium-rewritten;
+    every listing still gets its own keyword in the copy.
+    """
+    bodies = [_dedupe_leading(text) for text in texts]
+    matcher = registry.matcher
+    index = get_keyword_index()
+    count = len(texts)
+
+    with STAGE_SECONDS.time(stage="classify"):
+        if clusterer is None:
+            ranked = [matcher.rank(matcher.score(text), 3) for text in texts]
+        else:
+            ranked, families = _classify_families(texts, matcher, clusterer)
+        categories = [scores[0][0] if scores else "General" for scores in ranked]
+    with STAGE_SECONDS.time(stage="keywords"):
+        batch = TokenBatch(bodies)
+        keywords = [_pick_keyword(batch.tokens_of(i)) for i in range(count)]
+        if index is not None:
+            seo = [", ".join(index.top_keywords(batch.tokens_of(i))) or NO_KEYWORDS for i in range(count)]
+        else:
+            # Clean renderings depend only on (category, keyword): variants and
+            # listings sharing a brand keyword reuse one formatted list.
+            seen = {}
+            seo = []
+            for i in range(count):
+                key = (categories[i], keywords[i])
+                words = seen.get(key)
+                if words is None:
+                    words = _output_keywords(bodies[i], keywords[i], categories[i], mode, registry)
+                    compiled = registry.rendering(categories[i], "Persuasive", _prefix(mode))
+                    if compiled is not None and compiled.clean:
+                        seen[key] = words
+                seo.append(words)
+
+    groups = {}
+    for i, category in enumerate(categories):
+        groups.setdefault(category, []).append(i)
+    variants = [{} for _ in texts]
+    with STAGE_SECONDS.time(stage="render"):
+        for category, members in groups.items():
+            group_keywords = [keywords[i] for i in members]
+            group_bodies = [bodies[i] for i in members]
+            for tone in tones:
+                outputs = _render_many(group_keywords, category, tone, mode, registry, group_bodies)
+                for i, output in zip(members, outputs):
+                    variants[i][tone] = output
+    for stage in ("classify", "keywords", "render"):
+        STAGE_LISTINGS.inc(count, stage=stage)
+    if not mode.startswith("Fast") and get_rewriter() is not None:
+        if clusterer is None:
+            fell_back = _polish_chunk(bodies, keywords, categories, variants, tones, mode)
+        else:
+            fell_back = _polish_chunk(bodies, keywords, categories, variants, tones, mode,
+                                      families, clusterer.family_rewrites)
+    else:
+        fell_back = ()
+
+    results = [
+        {
+            "category": category,
+            "category_scores": ranked[i],
+            "tones": variants[i],
+            "keywords": seo[i],
+        }
+        for i, category in enumerate(categories)
+    ]
+    if clusterer is not None:
+        for result, family in zip(results, families):
+            result["family"] = family
+    for i in fell_back:
+        results[i]["rewrite_fallback"] = True
+    return results
+
+def _polish_chunk(bodies, keywords, categories, variants, tones, mode, families=None, shared=None):
+    """Swap a chunk's drafts in ``variants`` for Premium rewrites; return indices that kept a draft.
+
+    One call for the whole chunk so the backend sees full micro-batches. With
+    ``families``, one listing per family and tone is rewritten (unless
+    ``shared`` already holds that rewrite) and the other variants get it with
+    their own keyword in place of the representative's.
+    """
+    families = families or [None] * len(bodies)
+    shared = {} if shared is None else shared
+    slots, owners = [], {}
+    for i, family in enumerate(families):
+        for tone in tones:
+            if family is not None:
+                key = (family, mode, tone)
+                if key in shared or key in owners:
+                    continue
+                owners[key] = i
+            slots.append((i, tone))
+    requests = [(bodies[i], tone, categories[i], variants[i][tone]) for i, tone in slots]
+    outputs, fallbacks = _polish(requests, mode)
+    fell_back = set()
+    for n, ((i, tone), output) in enumerate(zip(slots, outputs)):
+        variants[i][tone] = output
+        if n in fallbacks:
+            fell_back.add(i)
+        elif families[i] is not None:
+            shared[(families[i], mode, tone)] = (keywords[i], output)
+    for i, family in enumerate(families):
+        if family is None:
+            continue
+        for tone in tones:
+            key = (family, mode, tone)
+            if owners.get(key) == i:
+                continue
+            if key in shared:
+                keyword, output = shared[key]
+                variants[i][tone] = output if keyword == keywords[i] else output.replace(keyword, keywords[i])
+            else:  # the representative's rewrite failed; keep this draft too
+                fell_back.add(i)
+    return fell_back
+
+def _finish(listing, cached, trace):
+    result = {
+        "listing": listing,
+        "category": cached["category"],
+        "category_scores": list(cached["category_scores"]),
+        "tones": dict(cached["tones"]),
+        "keywords": cached["keywords"],
+    }
+    for field in ("family", "rewrite_fallback"):
+        if field in cached:
+            result[field] = cached[field]
+    if trace is not None:
+        scores = result["category_scores"]
+        score = scores[0][1] if scores else 0.0
+        trace.record(listing, result["category"], _matched_keyword(listing, result["category"]), score)
+    return result
+
+def process_listing(listing, mode="Fast", trace=None, tones=None, clusterer=None):
+    """Run the full pipeline for one listing and return a result dict.
+
+    Only ``tones`` (default: all five) are rendered. The whole result is
+    memoized on the normalized listing, so duplicate lines cost one cache lookup.
+    """
+    return process_chunk([listing], mode, trace, tones, clusterer)[0]
+
+def process_chunk(listings, mode="Fast", trace=None, tones=None, clusterer=None):
+    """Run the pipeline over a list of listings; only cache misses are computed.
+
+    Lines repeated within the chunk are computed once and count as cache hits.
+    With a ``VariantClusterer`` near-duplicates share their family's category
+    (and Premium rewrite) and results carry a ``family`` id; family ids only
+    mean something within one clusterer, so they're added after the cache
+    rather than stored in it. Results where a Premium rewrite failed and the
+    template draft was kept are marked ``rewrite_fallback`` and aren't cached.
+    """
+    tones = tuple(tones or TONES)
+    registry = get_registry()
+    cache = get_cache()
+    versions = _versions(registry)
+    if clusterer is not None:
+        clusterer.bind(registry, versions)
+    texts = [normalize_listing(listing) for listing in listings]
+    keys = [("result", listing_digest(text), mode, tones, versions) for text in texts]
+    BATCH_SIZE.observe(len(listings))
+    first = {}
+    for i, key in enumerate(keys):
+        first.setdefault(key, i)
+    cached = [None] * len(keys)
+    for key, i in first.items():
+        cached[i] = cache.get(key)
+    misses = [i for i in first.values() if cached[i] is None]
+    if misses:
+        computed = _compute_many([texts[i] for i in misses], mode, registry, tones, clusterer)
+        for i, result in zip(misses, computed):
+            if not result.get("rewrite_fallback"):
+                cache.put(keys[i], {field: value for field, value in result.items() if field != "family"})
+            cached[i] = result
+    for i, key in enumerate(keys):
+        if cached[i] is None:  # repeats an earlier line of this chunk
+            value = cached[first[key]]
+            cached[i] = value if value.get("rewrite_fallback") else cache.get(key, value)
+    results = [_finish(listing, value, trace) for listing, value in zip(listings, cached)]
+    if clusterer is not None:
+        for result, text in zip(results, texts):
+            if "family" not in result:  # answered from the cache
+                result["family"] = clusterer.family(text)
+    return results
+
+def optimize_batch(listings, mode="Fast", trace=None, chunk_size=CHUNK_SIZE, tones=None, dedupe=False):
+    """Lazily yield one result dict per non-empty listing, a chunk at a time.
+
+    ``dedupe=True`` (or a ``VariantClusterer``) groups near-duplicate variants
+    across the whole feed so each family is classified (and Premium-rewritten) once.
+    """
+    clusterer = dedupe if isinstance(dedupe, VariantClusterer) else VariantClusterer() if dedupe else None
+    stripped = (listing.strip() for listing in listings)
+    for chunk in chunked((listing for listing in stripped if listing), chunk_size):
+        yield from process_chunk(chunk, mode, trace, tones, clusterer)
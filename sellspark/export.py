@@ -0,0 +1,142 @@
+"""Single-file exports of optimized listings: one row per listing × tone.
+
+Results are written incrementally to a file as they are produced, so a bulk
+run yields exactly one machine-readable artifact (CSV, JSON Lines or XLSX)
+instead of one download per listing. XLSX needs the optional ``openpyxl``
+package.
+"""
+
+# --- Imports ---
+import csv
+import importlib.util
+import json
+import os
+import tempfile
+import time
+
+from .feeds import CHUNK_SIZE
+from .metrics import STAGE_LISTINGS, STAGE_SECONDS
+
+EXPORT_FIELDS = ["row", "listing", "category", "tone", "output", "keywords"]
+EXPORT_FORMATS = ("csv", "jsonl", "xlsx")
+MIME_TYPES = {
+    "csv": "text/csv",
+    "jsonl": "application/x-ndjson",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+
+
+def xlsx_available():
+    """Return True if ``openpyxl`` is installed."""
+    return importlib.util.find_spec("openpyxl") is not None
+
+
+def available_formats():
+    return [fmt for fmt in EXPORT_FORMATS if fmt != "xlsx" or xlsx_available()]
+
+
+def iter_rows(result, row):
+    """Yield one export row per tone of a single result dict."""
+    for tone, output in result["tones"].items():
+        yield {
+            "row": row,
+            "listing": result["listing"],
+            "category": result["category"],
+            "tone": tone,
+            "output": output,
+            "keywords": result["keywords"],
+        }
+
+
+class ExportWriter:
+    """Append results to one export file; use as a context manager.
+
+    When ``path`` is omitted a temporary file is created (and kept on close)
+    so it can be served as a download.
+    """
+
+    def __init__(self, fmt="csv", path=None):
+        if fmt not in EXPORT_FORMATS:
+            raise ValueError(f"Unknown export format '{fmt}'; choose from {', '.join(EXPORT_FORMATS)}")
+        if fmt == "xlsx" and not xlsx_available():
+            raise RuntimeError("XLSX export needs openpyxl; install it or choose CSV/JSONL.")
+        if path is None:
+            fd, path = tempfile.mkstemp(prefix="sellspark_", suffix=f".{fmt}")
+            os.close(fd)
+        self.fmt = fmt
+        self.path = path
+        self.count = 0
+        if fmt == "xlsx":
+            from openpyxl import Workbook
+            self._workbook = Workbook(write_only=True)
+            self._sheet = self._workbook.create_sheet("listings")
+            self._sheet.append(EXPORT_FIELDS)
+        else:
+            self._file = open(path, "w", encoding="utf-8", newline="")
+            if fmt == "csv":
+                self._csv = csv.DictWriter(self._file, fieldnames=EXPORT_FIELDS)
+                self._csv.writeheader()
+
+    def write(self, results):
+        """Append result dicts; return how many listings were written."""
+        written = 0
+        busy = 0.0
+        clock = time.perf_counter
+        for result in results:
+            start = clock()
+            self.count += 1
+            written += 1
+            for row in iter_rows(result, self.count):
+                if self.fmt == "csv":
+                    self._csv.writerow(row)
+                elif self.fmt == "jsonl":
+                    self._file.write(json.dumps(row, ensure_ascii=False) + "\n")
+                else:
+                    self._sheet.append([row[field] for field in EXPORT_FIELDS])
+            busy += clock() - start
+            if written % CHUNK_SIZE == 0:  # one sample per chunk, like the other stages
+                STAGE_SECONDS.observe(busy, stage="export")
+                STAGE_LISTINGS.inc(CHUNK_SIZE, stage="export")
+                busy = 0.0
+        # Only time spent writing counts; ``results`` may be a lazy pipeline.
+        if written % CHUNK_SIZE:
+            STAGE_SECONDS.observe(busy, stage="export")
+            STAGE_LISTINGS.inc(written % CHUNK_SIZE, stage="export")
+        return written
+
+    def close(self):
+        if self.fmt == "xlsx":
+            self._workbook.save(self.path)
+        else:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+
+def export_results(results, fmt="csv", path=None):
+    """Write all results to a single export file and return its path.
+
+    A temporary file created here is removed again if writing fails.
+    """
+    writer = ExportWriter(fmt, path)
+    try:
+        with writer:
+            writer.write(results)
+    except BaseException:
+        if path is None:
+            remove_export(writer.path)
+        raise
+    return writer.path
+
+
+def remove_export(path):
+    """Delete an export file, ignoring one that is already gone."""
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
@@ -0,0 +1,150 @@
+"""Streaming readers and writers for catalog feeds.
+
+Listings are read lazily from plain text (one per line), CSV or JSON Lines
+exports and processed in fixed-size chunks, so a feed never has to fit in
+memory: only one chunk of inputs and outputs is alive at a time. A ``.json``
+export holding a single array is the exception and is parsed whole.
+"""
+
+# --- Imports ---
+import csv
+import io
+import itertools
+import json
+import os
+import time
+
+from .metrics import STAGE_LISTINGS, STAGE_SECONDS
+
+FORMATS = ("txt", "csv", "jsonl", "json")
+CHUNK_SIZE = 1000
+
+# Column/field names tried, in order, when the caller doesn't name one.
+LISTING_FIELDS = ("listing", "title", "product_title", "name", "description", "text")
+
+
+def detect_format(filename, default="txt"):
+    """Guess the feed format from a file name's extension."""
+    ext = os.path.splitext(filename or "")[1].lower().lstrip(".")
+    if ext == "ndjson":
+        return "jsonl"
+    return ext if ext in FORMATS else default
+
+
+def _pick_field(fields, column):
+    if column:
+        if column not in fields:
+            raise ValueError(f"Column '{column}' not found; available: {', '.join(fields)}")
+        return column
+    lowered = {field.lower().strip(): field for field in fields}
+    for name in LISTING_FIELDS:
+        if name in lowered:
+            return lowered[name]
+    if not fields:
+        raise ValueError("No columns to read listings from")
+    return fields[0]
+
+
+def _iter_csv(stream, column):
+    reader = csv.reader(stream)
+    try:
+        header = next(reader, None)
+        if not header:
+            return
+        index = header.index(_pick_field(header, column))
+        for row in reader:
+            if index < len(row):
+                yield row[index]
+    except csv.Error as e:  # oversized fields, NUL bytes, ...
+        raise ValueError(f"Line {reader.line_num} is not valid CSV: {e}") from e
+
+
+def _iter_records(records, column):
+    """Listing strings from decoded JSON records (strings or objects)."""
+    field = None
+    for label, record in records:
+        if isinstance(record, str):
+            yield record
+            continue
+        if not isinstance(record, dict):
+            raise ValueError(f"{label} must be a string or an object, not {type(record).__name__}")
+        if field is None:
+            field = _pick_field(list(record), column)
+        value = record.get(field)
+        if value is not None:
+            yield str(value)
+
+
+def _decode_lines(lines):
+    for line_no, line in enumerate(lines, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield f"Line {line_no}", json.loads(line)
+        except ValueError as e:
+            raise ValueError(f"Line {line_no} is not valid JSON: {e}") from e
+
+
+def _iter_jsonl(stream, column):
+    return _iter_records(_decode_lines(stream), column)
+
+
+def _iter_json(stream, column):
+    # A JSON array can't be parsed incrementally with the stdlib, so it is read
+    # whole; files that turn out to hold JSON Lines are still read line by line.
+    text = stream.read()
+    if not text.lstrip().startswith("["):
+        return _iter_jsonl(io.StringIO(text), column)
+    try:
+        records = json.loads(text)
+    except ValueError as e:
+        raise ValueError(f"Not valid JSON: {e}") from e
+    return _iter_records(((f"Item {i}", record) for i, record in enumerate(records, start=1)), column)
+
+
+def iter_listings(stream, fmt="txt", column=None):
+    """Yield non-empty listing strings from a text stream, one at a time."""
+    if fmt == "csv":
+        rows = _iter_csv(stream, column)
+    elif fmt == "jsonl":
+        rows = _iter_jsonl(stream, column)
+    elif fmt == "json":
+        rows = _iter_json(stream, column)
+    else:
+        rows = stream
+    for listing in rows:
+        listing = listing.strip()
+        if listing:
+            yield listing
+
+
+def chunked(iterable, size=CHUNK_SIZE):
+    """Yield lists of up to ``size`` items from ``iterable``."""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def write_jsonl(results, dst):
+    """Write result dicts to ``dst`` as JSON Lines; return how many were written."""
+    count = 0
+    busy = 0.0
+    clock = time.perf_counter
+    for result in results:
+        start = clock()
+        dst.write(json.dumps(result, ensure_ascii=False) + "\n")
+        busy += clock() - start
+        count += 1
+        if count % CHUNK_SIZE == 0:  # one sample per chunk, like the other stages
+            STAGE_SECONDS.observe(busy, stage="export")
+            STAGE_LISTINGS.inc(CHUNK_SIZE, stage="export")
+            busy = 0.0
+    # Only time spent writing counts; ``results`` may be a lazy pipeline.
+    if count % CHUNK_SIZE:
+        STAGE_SECONDS.observe(busy, stage="export")
+        STAGE_LISTINGS.inc(count % CHUNK_SIZE, stage="export")
+    return count
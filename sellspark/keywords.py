@@ -0,0 +1,201 @@
+"""Tokenization and keyword extraction, per listing or over whole batches.
+
+A listing is tokenized once; the main keyword and the keyword list both come
+from that single token stream. ``TokenBatch`` stores a batch columnar-style
+(one flat token list plus an ``array`` of per-listing offsets) so a chunk of
+listings is tokenized in one pass and sliced per listing without copying
+strings around.
+
+With a ``KeywordIndex`` built over the catalog, keywords are ranked by TF-IDF
+instead: brand and filler words that appear everywhere sink, and the
+listing's distinctive terms become the main keyword and SEO keyword list.
+"""
+
+# --- Imports ---
+import hashlib
+import json
+import math
+import os
+import re
+from array import array
+
+TOKEN_RE = re.compile(r"\b[a-zA-Z][a-zA-Z0-9]+\b")
+MIN_KEYWORD_LENGTH = 4
+FALLBACK_KEYWORD = "your product"
+NO_KEYWORDS = "No keywords found."
+
+
+def tokenize(text):
+    """Return the word tokens keyword extraction works on."""
+    return TOKEN_RE.findall(text)
+
+
+def keyword_tokens(tokens):
+    """Filter tokens down to keyword candidates (longer than three characters)."""
+    return [token for token in tokens if len(token) >= MIN_KEYWORD_LENGTH]
+
+
+def main_keyword(tokens):
+    """Return the first keyword candidate, or a generic fallback."""
+    for token in tokens:
+        if len(token) >= MIN_KEYWORD_LENGTH:
+            return token
+    return FALLBACK_KEYWORD
+
+
+def format_keywords(words):
+    """Join unique keywords case-insensitively sorted, as shown to sellers."""
+    unique = sorted(set(words), key=lambda word: (word.lower(), word))
+    return ", ".join(unique) if unique else NO_KEYWORDS
+
+
+class TokenBatch:
+    """Tokens for a batch of texts: one flat list plus per-text offsets."""
+
+    def __init__(self, texts):
+        self.tokens = []
+        self.offsets = array("I", [0])
+        findall = TOKEN_RE.findall
+        for text in texts:
+            self.tokens.extend(findall(text))
+            self.offsets.append(len(self.tokens))
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def tokens_of(self, i):
+        return self.tokens[self.offsets[i]:self.offsets[i + 1]]
+
+    def main_keywords(self):
+        return [main_keyword(self.tokens_of(i)) for i in range(len(self))]
+
+    def keyword_lists(self):
+        return [format_keywords(keyword_tokens(self.tokens_of(i))) for i in range(len(self))]
+
+
+# --- Corpus-aware keyword ranking (TF-IDF) ---
+STOPWORDS = frozenset("""
+    about above after again against also among because been before being below between both
+    brand could does doing down during each every from further have having here into itself
+    just more most much only other over same should some such than that their them then there
+    these they this those through under until very were what when where which while with
+    would your yours pack pcs piece pieces size color colour free best item items product
+    products quality great high new
+""".split())
+TOP_KEYWORDS = 10
+
+
+class KeywordIndex:
+    """Document frequencies over a catalog, for ranking a listing's keywords.
+
+    The vocabulary maps each lowercased token to an id; document frequencies
+    and IDF weights live in parallel ``array`` columns, which keeps the index
+    compact for catalogs with millions of listings.
+    """
+
+    def __init__(self, n_docs=0, vocab=None, df=None):
+        self.n_docs = n_docs
+        self.vocab = dict(vocab or {})
+        self.df = array("I", df or [])
+        self._idf = None
+        self._version = None
+
+    @classmethod
+    def build(cls, texts):
+        """Count document frequencies over an iterable of listing texts."""
+        index = cls()
+        vocab, df = index.vocab, index.df
+        for text in texts:
+            index.n_docs += 1
+            for token in {token.lower() for token in tokenize(text)}:
+                token_id = vocab.get(token)
+                if token_id is None:
+                    vocab[token] = len(df)
+                    df.append(1)
+                else:
+                    df[token_id] += 1
+        return index
+
+    @property
+    def idf(self):
+        if self._idf is None:
+            n = self.n_docs
+            self._idf = array("d", (math.log((1 + n) / (1 + count)) + 1.0 for count in self.df))
+        return self._idf
+
+    @property
+    def version(self):
+        """Content hash of the index, so a rebuilt index never shares cache keys with the old one."""
+        if self._version is None:
+            h = hashlib.blake2b(f"{self.n_docs}\0".encode("utf-8"), digest_size=12)
+            for token, token_id in self.vocab.items():
+                h.update(f"{token}\0{self.df[token_id]}\0".encode("utf-8"))
+            self._version = h.hexdigest()
+        return self._version
+
+    def score(self, tokens):
+        """Return ``[(token, score), ...]`` best first; ties keep first occurrence."""
+        idf, vocab = self.idf, self.vocab
+        unseen = math.log(1 + self.n_docs) + 1.0
+        counts, first = {}, {}
+        for token in tokens:
+            if len(token) < MIN_KEYWORD_LENGTH:
+                continue
+            lowered = token.lower()
+            if lowered in STOPWORDS:
+                continue
+            if lowered not in counts:
+                counts[lowered] = 0
+                first[lowered] = token
+            counts[lowered] += 1
+        scored = []
+        for position, (lowered, count) in enumerate(counts.items()):
+            token_id = vocab.get(lowered)
+            weight = idf[token_id] if token_id is not None else unseen
+            scored.append((-count * weight, position, first[lowered]))
+        scored.sort()
+        return [(token, round(-neg, 4)) for neg, _, token in scored]
+
+    def top_keywords(self, tokens, top_n=TOP_KEYWORDS):
+        return [token for token, _ in self.score(tokens)[:top_n]]
+
+    def rank_many(self, texts, top_n=TOP_KEYWORDS):
+        """Rank keywords for a batch of texts, tokenizing them in one pass."""
+        batch = TokenBatch(texts)
+        return [self.top_keywords(batch.tokens_of(i), top_n) for i in range(len(batch))]
+
+    def save(self, path):
+        words = [None] * len(self.df)
+        for token, token_id in self.vocab.items():
+            words[token_id] = token
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"n_docs": self.n_docs, "vocab": words, "df": list(self.df)}, f)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, encoding="utf-8") as f:
+            doc = json.load(f)
+        vocab = {token: token_id for token_id, token in enumerate(doc["vocab"])}
+        return cls(doc["n_docs"], vocab, doc["df"])
+
+
+# --- Active index ---
+_index = None
+_index_loaded = False
+
+
+def get_keyword_index():
+    """Return the catalog index named by ``SELLSPARK_KEYWORD_INDEX``, or ``None``."""
+    global _index, _index_loaded
+    if not _index_loaded:
+        path = os.environ.get("SELLSPARK_KEYWORD_INDEX")
+        _index = KeywordIndex.load(path) if path else None
+        _index_loaded = True
+    return _index
+
+
+def set_keyword_index(index):
+    """Use ``index`` (or ``None`` for plain extraction) for ranking from now on."""
+    global _index, _index_loaded
+    _index = index
+    _index_loaded = True
@@ -0,0 +1,133 @@
+"""Compiled multi-keyword matcher (Aho-Corasick) for category detection.
+
+The keyword table is compiled once into a single automaton, so a listing is
+scanned in one linear pass no matter how many categories or keywords exist.
+Matches are whole words only: "pan" no longer fires inside "company" and
+"car" no longer fires inside "scarf". A trailing plural "s"/"es" is accepted
+so "shirts" still matches "shirt".
+
+Scoring counts weighted hits for every category in the same pass, so the
+answer no longer depends on dictionary order: multi-word keywords weigh more
+(they are more specific) and keywords shared by several categories ("car",
+"charger", "oil") are split between them.
+"""
+
+# --- Imports ---
+import heapq
+from collections import deque
+
+PLURAL_SUFFIXES = ("s", "es")
+
+
+def _is_word_char(ch):
+    return ch.isalnum()
+
+
+class KeywordMatcher:
+    """Aho-Corasick automaton over ``{category: [keyword, ...]}``."""
+
+    def __init__(self, table):
+        self.categories = list(table)
+        # Each pattern is (keyword, category index); node outputs hold pattern ids.
+        self.patterns = []
+        self.weights = []
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [[]]
+        for cat_index, category in enumerate(self.categories):
+            for keyword in table[category]:
+                keyword = keyword.lower().strip()
+                if keyword:
+                    self._add(keyword, len(self.patterns))
+                    self.patterns.append((keyword, cat_index))
+        self._build_links()
+        self._compute_weights()
+
+    def _compute_weights(self):
+        shared = {}
+        for keyword, _ in self.patterns:
+            shared[keyword] = shared.get(keyword, 0) + 1
+        self.weights = [
+            len(keyword.split()) / shared[keyword] for keyword, _ in self.patterns
+        ]
+
+    def _add(self, keyword, pattern_id):
+        node = 0
+        for ch in keyword:
+            nxt = self._goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            node = nxt
+        self._out[node].append(pattern_id)
+
+    def _build_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, nxt in self._goto[node].items():
+                queue.append(nxt)
+                fail = self._fail[node]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[nxt] = self._goto[fail].get(ch, 0)
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def _word_end(self, text, end):
+        """Return True if a match ending at ``end`` closes a (possibly plural) word."""
+        if end == len(text) or not _is_word_char(text[end]):
+            return True
+        for suffix in PLURAL_SUFFIXES:
+            stop = end + len(suffix)
+            if text.startswith(suffix, end) and (stop == len(text) or not _is_word_char(text[stop])):
+                return True
+        return False
+
+    def _iter_ids(self, text):
+        """Yield ``(start, pattern_id)`` for each whole-word match in lowered text."""
+        goto, fail, out = self._goto, self._fail, self._out
+        node = 0
+        for i, ch in enumerate(text):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            if not out[node]:
+                continue
+            end = i + 1
+            for pattern_id in out[node]:
+                start = end - len(self.patterns[pattern_id][0])
+                if start > 0 and _is_word_char(text[start - 1]):
+                    continue
+                if not self._word_end(text, end):
+                    continue
+                yield start, pattern_id
+
+    def finditer(self, text):
+        """Yield ``(start, keyword, category)`` for each whole-word match."""
+        for start, pattern_id in self._iter_ids(text.lower()):
+            keyword, cat_index = self.patterns[pattern_id]
+            yield start, keyword, self.categories[cat_index]
+
+    def score(self, text):
+        """Return a list of weighted hit counts, one per category, in table order."""
+        scores = [0.0] * len(self.categories)
+        patterns, weights = self.patterns, self.weights
+        for _, pattern_id in self._iter_ids(text.lower()):
+            scores[patterns[pattern_id][1]] += weights[pattern_id]
+        return scores
+
+    def score_many(self, texts):
+        """Return the category score matrix for a batch: one row per text."""
+        return [self.score(text) for text in texts]
+
+    def rank(self, scores, top_k=3):
+        """Return up to ``top_k`` ``(category, score)`` pairs, best first.
+
+        Only categories with a positive score are returned; ties keep table order.
+        """
+        hits = [(score, -index) for index, score in enumerate(scores) if score > 0]
+        best = heapq.nlargest(top_k, hits)
+        return [(self.categories[-neg_index], round(score, 4)) for score, neg_index in best]
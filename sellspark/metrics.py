@@ -0,0 +1,213 @@
+"""Per-stage pipeline metrics in the Prometheus text format.
+
+The engine records stage timings (classify, keywords, render, rewrite,
+export), listings per stage and chunk sizes into module-level counters and
+histograms; cache hit/miss figures are read from the shared cache when the
+metrics are rendered. Everything is in-process and stdlib-only: expose it with
+``serve_metrics(port)`` (``GET /metrics``) or ``write_metrics(path)``.
+
+With ``optimize_parallel``, the classify/keywords/render/rewrite stages run
+in worker processes and are not collected; the parent records each chunk's
+size as its results come back, and the export stage (``ExportWriter`` or
+``write_jsonl``) runs in the parent as usual, recording one sample per
+``CHUNK_SIZE`` results written.
+"""
+
+# --- Imports ---
+import os
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+TIME_BUCKETS = (0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0)
+SIZE_BUCKETS = (1, 10, 50, 100, 500, 1000, 5000, 10000)
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _label_text(names, values):
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{value}"' for name, value in zip(names, values))
+    return "{" + pairs + "}"
+
+
+class Counter:
+    """Monotonic counter, optionally split by labels."""
+
+    kind = "counter"
+
+    def __init__(self, name, help, labels=()):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = tuple(labels.get(name, "") for name in self.labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels):
+        return self._values.get(tuple(labels.get(name, "") for name in self.labels), 0)
+
+    def samples(self):
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            yield f"{self.name}_total{_label_text(self.labels, key)} {value}"
+
+    def reset(self):
+        with self._lock:
+            self._values.clear()
+
+
+class Histogram:
+    """Cumulative-bucket histogram, optionally split by labels."""
+
+    kind = "histogram"
+
+    def __init__(self, name, help, labels=(), buckets=TIME_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self.buckets = tuple(buckets)
+        self._series = {}  # label values -> [bucket counts..., sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = tuple(labels.get(name, "") for name in self.labels)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0] * (len(self.buckets) + 2)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+                    break
+            series[-2] += value
+            series[-1] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        """Observe the wall time of the ``with`` block, in seconds."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def summary(self, **labels):
+        """Return ``(count, sum)`` for one label combination."""
+        series = self._series.get(tuple(labels.get(name, "") for name in self.labels))
+        return (series[-1], series[-2]) if series else (0, 0.0)
+
+    def samples(self):
+        with self._lock:
+            items = sorted((key, list(series)) for key, series in self._series.items())
+        for key, series in items:
+            names = self.labels + ("le",)
+            cumulative = 0
+            for bound, count in zip(self.buckets, series):
+                cumulative += count
+                yield f"{self.name}_bucket{_label_text(names, key + (repr(bound),))} {cumulative}"
+            yield f"{self.name}_bucket{_label_text(names, key + ('+Inf',))} {series[-1]}"
+            yield f"{self.name}_sum{_label_text(self.labels, key)} {series[-2]:.6f}"
+            yield f"{self.name}_count{_label_text(self.labels, key)} {series[-1]}"
+
+    def reset(self):
+        with self._lock:
+            self._series.clear()
+
+
+# --- Pipeline metrics ---
+STAGE_SECONDS = Histogram(
+    "sellspark_stage_seconds", "Wall time per pipeline stage call, in seconds.", ("stage",)
+)
+STAGE_LISTINGS = Counter("sellspark_stage_listings", "Listings handled per pipeline stage.", ("stage",))
+BATCH_SIZE = Histogram(
+    "sellspark_batch_size", "Listings per processed chunk.", buckets=SIZE_BUCKETS
+)
+METRICS = (STAGE_SECONDS, STAGE_LISTINGS, BATCH_SIZE)
+
+
+def _cache_lines():
+    from .cache import get_cache
+
+    stats = get_cache().stats()
+    return [
+        "# HELP sellspark_cache_lookups_total Result cache lookups by outcome.",
+        "# TYPE sellspark_cache_lookups_total counter",
+        f'sellspark_cache_lookups_total{{result="hit"}} {stats["hits"]}',
+        f'sellspark_cache_lookups_total{{result="miss"}} {stats["misses"]}',
+        "# HELP sellspark_cache_hit_ratio Share of cache lookups that hit.",
+        "# TYPE sellspark_cache_hit_ratio gauge",
+        f"sellspark_cache_hit_ratio {stats['hit_ratio']}",
+        "# HELP sellspark_cache_entries Entries held in memory by the result cache.",
+        "# TYPE sellspark_cache_entries gauge",
+        f"sellspark_cache_entries {stats['size']}",
+    ]
+
+
+def render_metrics():
+    """Return all metrics in the Prometheus text exposition format."""
+    lines = []
+    for metric in METRICS:
+        lines.append(f"# HELP {metric.name}{'_total' if metric.kind == 'counter' else ''} {metric.help}")
+        lines.append(f"# TYPE {metric.name}{'_total' if metric.kind == 'counter' else ''} {metric.kind}")
+        lines.extend(metric.samples())
+    lines.extend(_cache_lines())
+    return "\n".join(lines) + "\n"
+
+
+def stage_summary():
+    """Rows of ``{stage, calls, listings, seconds}`` for display."""
+    rows = []
+    for (stage,) in sorted(STAGE_SECONDS._series):
+        calls, seconds = STAGE_SECONDS.summary(stage=stage)
+        rows.append({
+            "stage": stage,
+            "calls": calls,
+            "listings": STAGE_LISTINGS.value(stage=stage),
+            "seconds": round(seconds, 4),
+        })
+    return rows
+
+
+def reset_metrics():
+    for metric in METRICS:
+        metric.reset()
+
+
+def write_metrics(path):
+    """Atomically write the current metrics to ``path`` (e.g. for node_exporter's textfile collector)."""
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(render_metrics())
+    os.replace(tmp, path)
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = render_metrics().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def serve_metrics(port=9108, host="127.0.0.1"):
+    """Serve ``GET /metrics`` from a background thread; returns the server."""
+    server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    threading.Thread(target=server.serve_forever, name="sellspark-metrics", daemon=True).start()
+    return server
@@ -0,0 +1,181 @@
+"""Lazy access to the heavy ML stack used by model-backed (Premium) modes.
+
+Nothing in the template path imports torch; model-backed code calls
+``load_torch()`` when it actually needs it, so cold starts and Streamlit
+reruns stay cheap. ``LocalRewriter`` runs Premium rewrites on a local CPU
+model instead of a hosted endpoint, so catalog text never leaves the machine.
+"""
+
+# --- Imports ---
+import importlib
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future, InvalidStateError
+from concurrent.futures import TimeoutError as FutureTimeout
+
+from .rewrite import build_prompt
+
+log = logging.getLogger(__name__)
+
+_torch = None
+
+
+class ModelBackendUnavailable(RuntimeError):
+    """Raised when a model-backed mode is requested but its dependencies are missing."""
+
+
+def load_torch():
+    """Import and return ``torch`` on first use."""
+    global _torch
+    if _torch is None:
+        try:
+            _torch = importlib.import_module("torch")
+        except ImportError as e:
+            raise ModelBackendUnavailable(
+                "Premium mode needs PyTorch; install torch to enable it."
+            ) from e
+    return _torch
+
+
+def torch_loaded():
+    """Return True if torch has already been imported in this process."""
+    return _torch is not None
+
+
+def load_transformers():
+    """Import and return ``transformers`` (needed for local rewrite models)."""
+    try:
+        return importlib.import_module("transformers")
+    except ImportError as e:
+        raise ModelBackendUnavailable(
+            "Local Premium rewrites need transformers; install it to enable them."
+        ) from e
+
+
+# --- Local CPU rewrite model ---
+DEFAULT_LOCAL_MODEL = "google/flan-t5-small"
+MAX_LATENCY = 0.05  # seconds a request may wait for its batch to fill
+TIMEOUT = 10.0  # seconds a rewrite_many call waits in total before keeping template copy
+
+
+class LocalRewriter:
+    """Premium rewrite backend running a seq2seq model on CPU, in-process.
+
+    Requests from all callers (threads, Streamlit sessions) share one queue; a
+    single worker thread takes up to ``max_batch`` prompts, waiting at most
+    ``max_latency`` after the first one, and generates them together. Linear
+    layers are quantized to int8 with dynamic quantization unless
+    ``quantize=False``. Nothing is imported or loaded until first use (or
+    ``load()``). A failed batch, or a request still unanswered ``timeout``
+    seconds after ``rewrite_many`` was called, returns ``None`` so callers keep
+    template copy; timed-out requests not yet generated are dropped.
+    """
+
+    def __init__(self, model_name=DEFAULT_LOCAL_MODEL, max_batch=16, max_latency=MAX_LATENCY,
+                 quantize=True, max_new_tokens=64, max_input_tokens=256, timeout=TIMEOUT):
+        self.model_name = model_name
+        self.max_batch = max_batch
+        self.max_latency = max_latency
+        self.timeout = timeout
+        self.quantize = quantize
+        self.max_new_tokens = max_new_tokens
+        self.max_input_tokens = max_input_tokens
+        self._model = None
+        self._tokenizer = None
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._worker = None
+        self._load_error = None
+
+    @property
+    def name(self):
+        return f"local:{self.model_name}:{'int8' if self.quantize else 'fp32'}"
+
+    def load(self):
+        """Load (and quantize) the model now instead of on the first request."""
+        with self._lock:
+            if self._model is None:
+                torch = load_torch()
+                transformers = load_transformers()
+                tokenizer = transformers.AutoTokenizer.from_pretrained(self.model_name)
+                model = transformers.AutoModelForSeq2SeqLM.from_pretrained(self.model_name)
+                model.eval()
+                if self.quantize:
+                    model = torch.quantization.quantize_dynamic(
+                        model, {torch.nn.Linear}, dtype=torch.qint8
+                    )
+                self._tokenizer, self._model = tokenizer, model
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._serve, name="sellspark-rewriter", daemon=True)
+                self._worker.start()
+        return self
+
+    def generate(self, prompts):
+        """Generate one rewrite per prompt in a single batch."""
+        torch = load_torch()
+        encoded = self._tokenizer(
+            prompts, return_tensors="pt", padding=True, truncation=True,
+            max_length=self.max_input_tokens,
+        )
+        with torch.inference_mode():
+            output = self._model.generate(**encoded, max_new_tokens=self.max_new_tokens, num_beams=1)
+        texts = self._tokenizer.batch_decode(output, skip_special_tokens=True)
+        return [text.strip() or None for text in texts]
+
+    def _serve(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.max_latency
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            batch = [item for item in batch if not item[1].cancelled()]  # callers that timed out
+            if not batch:
+                continue
+            # Similar lengths batch together with less padding.
+            batch.sort(key=lambda item: len(item[0]))
+            try:
+                outputs = self.generate([prompt for prompt, _ in batch])
+            except Exception as e:  # keep template copy for this batch
+                log.warning("Local rewrite batch of %d failed: %r", len(batch), e)
+                outputs = [None] * len(batch)
+            for (_, future), output in zip(batch, outputs):
+                try:
+                    future.set_result(output)
+                except InvalidStateError:  # cancelled by a timed-out caller meanwhile
+                    pass
+
+    def rewrite_many(self, requests):
+        """Rewrite ``(listing, tone, category, draft)`` requests; ``None`` where it failed."""
+        if not requests or self._load_error is not None:
+            return [None] * len(requests)
+        try:
+            self.load()
+        except Exception as e:  # remembered, so later calls don't retry the load
+            log.warning("Local rewrite model %s unavailable: %r", self.model_name, e)
+            self._load_error = e
+            return [None] * len(requests)
+        deadline = time.monotonic() + self.timeout
+        futures = []
+        for request in requests:
+            future = Future()
+            self._queue.put((build_prompt(*request), future))
+            futures.append(future)
+        outputs = []
+        for future in futures:
+            try:
+                outputs.append(future.result(timeout=max(0.0, deadline - time.monotonic())))
+            except FutureTimeout:
+                future.cancel()
+                outputs.append(None)
+        timed_out = sum(future.cancelled() for future in futures)
+        if timed_out:
+            log.warning("Local rewrite: %d request(s) timed out after %.1fs", timed_out, self.timeout)
+        return outputs
@@ -0,0 +1,96 @@
+"""Process-pool bulk optimizer.
+
+Listings are sharded into chunks and spread over a pool of worker processes;
+results come back in input order. The compiled template registry is built in
+the parent before the pool starts, so on platforms with ``fork`` every worker
+inherits it copy-on-write instead of compiling its own. Each worker opens
+its own result cache (a SQLite connection can't cross ``fork``) and writes its
+new entries through after every chunk. At most ``2 × workers`` chunks are in
+flight, so memory stays bounded on huge feeds.
+"""
+
+# --- Imports ---
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from . import cache
+from .dedupe import DEFAULT_THRESHOLD, VariantClusterer
+from .engine import process_chunk
+from .feeds import CHUNK_SIZE, chunked
+from .metrics import BATCH_SIZE
+from .registry import get_registry
+
+
+_clusterer = None
+
+
+def _warm_worker():
+    cache.reopen()
+    get_registry()
+
+
+def _process(chunk, mode, tones):
+    try:
+        return process_chunk(chunk, mode, None, tones)
+    finally:
+        cache.get_cache().flush()
+
+
+def _process_deduped(chunk, mode, tones, threshold):
+    """Worker-side chunk processing with a per-process variant clusterer."""
+    global _clusterer
+    if _clusterer is None or _clusterer.threshold != threshold:
+        _clusterer = VariantClusterer(threshold)
+    try:
+        return process_chunk(chunk, mode, None, tones, _clusterer)
+    finally:
+        cache.get_cache().flush()
+
+
+def _collect(future):
+    # Worker-side metrics stay in the worker; record chunk sizes here instead.
+    results = future.result()
+    BATCH_SIZE.observe(len(results))
+    return results
+
+
+def _pool_context():
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("fork" if "fork" in methods else "spawn")
+
+
+def optimize_parallel(listings, mode="Fast", workers=None, chunk_size=CHUNK_SIZE, tones=None,
+                      dedupe=False, threshold=DEFAULT_THRESHOLD):
+    """Yield one result dict per non-empty listing, in order, using a process pool.
+
+    ``workers`` defaults to the number of CPUs; with one worker this falls
+    back to in-process chunked processing. With ``dedupe`` each worker keeps
+    its own variant clusterer, so a family seen by several workers is
+    classified once per worker and family ids are per worker.
+    """
+    workers = workers or os.cpu_count() or 1
+    stripped = (listing.strip() for listing in listings)
+    chunks = chunked((listing for listing in stripped if listing), chunk_size)
+    if workers <= 1:
+        clusterer = VariantClusterer(threshold) if dedupe else None
+        for chunk in chunks:
+            yield from process_chunk(chunk, mode, None, tones, clusterer)
+        return
+
+    get_registry()  # compile once in the parent; forked workers share it
+    cache.get_cache().flush()  # workers read the file, not the parent's pending writes
+    with ProcessPoolExecutor(
+        max_workers=workers, mp_context=_pool_context(), initializer=_warm_worker
+    ) as pool:
+        pending = deque()
+        for chunk in chunks:
+            if dedupe:
+                pending.append(pool.submit(_process_deduped, chunk, mode, tones, threshold))
+            else:
+                pending.append(pool.submit(_process, chunk, mode, tones))
+            if len(pending) >= 2 * workers:
+                yield from _collect(pending.popleft())
+        while pending:
+            yield from _collect(pending.popleft())
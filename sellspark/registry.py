@@ -0,0 +1,292 @@
+"""Process-wide, read-only registry of compiled templates and keyword tables.
+
+Copy lives in a versioned JSON file (``data/templates.json`` by default, or the
+path in ``SELLSPARK_TEMPLATES``). It is compiled once per process: format
+strings are pre-parsed into literal/placeholder segments, keyword lists are
+frozen and the category matcher is built. Every caller (Streamlit reruns, CLI,
+workers) shares the same instance through ``get_registry()``.
+
+The file is watched by modification time. When it changes, a new registry is
+compiled off to the side and swapped in with a single reference assignment,
+so in-flight requests keep the registry they started with and nothing has to
+restart. A file that fails to load is logged and the previous registry stays.
+
+Category names are reconciled at load time: ``category_aliases`` maps names
+used by the keyword table (or by callers) onto template categories, keyword
+categories are merged under their canonical name, and every known name is
+pre-resolved into a flat ``(category, tone) -> templates`` index.
+"""
+
+# --- Imports ---
+import hashlib
+import json
+import logging
+import os
+import re
+import string
+import threading
+import time
+from types import MappingProxyType
+
+from .keywords import keyword_tokens, tokenize
+from .matcher import KeywordMatcher
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PATH = os.path.join(os.path.dirname(__file__), "data", "templates.json")
+RELOAD_INTERVAL = 2.0  # seconds between modification-time checks
+TEMPLATE_FIELDS = frozenset({"keyword"})  # the only value the engine substitutes
+
+_FORMATTER = string.Formatter()
+_WORD_CHAR = re.compile(r"\w")
+
+
+class CompiledTemplate:
+    """A format string split once into literal and ``{field}`` segments.
+
+    ``parts`` is the flattened segment list with ``None`` where a value goes
+    and ``slots`` records those positions, so rendering is one buffer fill and
+    one ``str.join`` with no format-string parsing.
+
+    ``keyword_tokens`` holds the keyword candidates of the literal text. When
+    ``clean`` is true no placeholder touches a word character, so the keywords
+    of a rendered line are exactly these plus those of the substituted values.
+    """
+
+    __slots__ = ("source", "literals", "fields", "parts", "slots", "keyword_tokens", "clean")
+
+    def __init__(self, source):
+        self.source = source
+        literals, fields = [], []
+        for literal, field, spec, conversion in _FORMATTER.parse(source):
+            if spec or conversion:
+                raise ValueError(f"Unsupported format spec in template: {source!r}")
+            literals.append(literal)
+            fields.append(field)
+        self.literals = tuple(literals)
+        self.fields = tuple(fields)
+        parts, slots = [], []
+        for literal, field in zip(literals, fields):
+            if literal:
+                parts.append(literal)
+            if field is not None:
+                slots.append((len(parts), field))
+                parts.append(None)
+        self.parts = tuple(parts)
+        self.slots = tuple(slots)
+        self.keyword_tokens = tuple(keyword_tokens(tokenize("\n".join(literals))))
+        self.clean = all(
+            not (_WORD_CHAR.match(literals[i][-1:]) or
+                 (i + 1 < len(literals) and _WORD_CHAR.match(literals[i + 1][:1])))
+            for i, field in enumerate(fields) if field is not None
+        )
+
+    def render(self, **values):
+        buf = list(self.parts)
+        for index, field in self.slots:
+            buf[index] = str(values[field])
+        return "".join(buf)
+
+    def render_many(self, values, field="keyword"):
+        """Render once per value of ``field``, reusing one preallocated buffer."""
+        if not self.slots:
+            return [self.source] * len(values)
+        for _, name in self.slots:
+            if name != field:
+                raise KeyError(name)
+        buf = list(self.parts)
+        indexes = [index for index, _ in self.slots]
+        out = [None] * len(values)
+        join = "".join
+        for i, value in enumerate(values):
+            for index in indexes:
+                buf[index] = value
+            out[i] = join(buf)
+        return out
+
+    def __repr__(self):
+        return f"CompiledTemplate({self.source!r})"
+
+
+def _compile_tones(tones):
+    return MappingProxyType({
+        tone: tuple(CompiledTemplate(line) for line in lines)
+        for tone, lines in tones.items()
+    })
+
+
+def _fingerprint(*tables):
+    payload = json.dumps(tables, sort_keys=True, ensure_ascii=False).encode("utf-8")
+    return hashlib.sha1(payload).hexdigest()[:12]
+
+
+class TemplateRegistry:
+    """Immutable view over the compiled template and keyword tables."""
+
+    def __init__(self, rewrite_templates, default_template, category_keywords,
+                 category_aliases=None, version=None):
+        self.templates = MappingProxyType({
+            category: _compile_tones(tones) for category, tones in rewrite_templates.items()
+        })
+        self.default = _compile_tones(default_template)
+        self.aliases = MappingProxyType(dict(category_aliases or {}))
+        self.raw_category_keywords = MappingProxyType({
+            category: tuple(words) for category, words in category_keywords.items()
+        })
+        self.category_keywords = MappingProxyType(self._canonical_keywords())
+        self.matcher = KeywordMatcher(self.category_keywords)
+        self._index = self._build_index()
+        self._renderings = {}
+        self.version = version or _fingerprint(
+            rewrite_templates, default_template, category_keywords, dict(self.aliases)
+        )
+
+    def resolve(self, category):
+        """Map a category or alias to its canonical template category."""
+        return self.aliases.get(category, category)
+
+    def _canonical_keywords(self):
+        merged = {}
+        for category, words in self.raw_category_keywords.items():
+            bucket = merged.setdefault(self.resolve(category), [])
+            bucket.extend(word for word in words if word not in bucket)
+        return {category: tuple(words) for category, words in merged.items()}
+
+    def _build_index(self):
+        names = set(self.templates) | set(self.aliases) | set(self.raw_category_keywords)
+        index = {}
+        for name in names:
+            tones = self.templates.get(self.resolve(name), {})
+            for tone in set(tones) | set(self.default):
+                index[(name, tone)] = tones.get(tone) or self.default.get(tone)
+        return MappingProxyType(index)
+
+    def lookup(self, category, tone):
+        """Return the compiled templates for ``category``/``tone``.
+
+        Aliases resolve to their canonical category; unknown categories fall
+        back to the default template for the tone, or ``None``.
+        """
+        templates = self._index.get((category, tone))
+        if templates is None:
+            templates = self.default.get(tone)
+        return templates
+
+    def rendering(self, category, tone, prefix):
+        """Return the full two-line output for ``category``/``tone`` as one template.
+
+        The prefix, headline and tagline are compiled together on first use, so
+        each listing renders with a single join. Returns ``None`` when there is
+        no headline/tagline pair to render.
+        """
+        key = (category, tone, prefix)
+        try:
+            return self._renderings[key]
+        except KeyError:
+            pass
+        templates = self.lookup(category, tone)
+        compiled = None
+        if templates and len(templates) >= 2:
+            compiled = CompiledTemplate(f"{prefix} {templates[0].source}\n\n{templates[1].source}")
+        self._renderings[key] = compiled
+        return compiled
+
+    def validate(self):
+        """Return a list of human-readable problems with the loaded tables."""
+        problems = []
+        for alias, target in self.aliases.items():
+            if target not in self.templates:
+                problems.append(f"Alias '{alias}' points to unknown category '{target}'")
+        for category in self.raw_category_keywords:
+            if self.resolve(category) not in self.templates:
+                problems.append(f"Keyword category '{category}' has no templates or alias")
+        tables = [("default", self.default)] + list(self.templates.items())
+        for category, tones in tables:
+            for tone in self.default:
+                if tone not in tones:
+                    problems.append(f"'{category}' has no '{tone}' templates")
+            for tone, lines in tones.items():
+                if len(lines) < 2:
+                    problems.append(f"'{category}'/'{tone}' needs a headline and a tagline")
+                elif "keyword" not in lines[0].fields + lines[1].fields:
+                    problems.append(f"'{category}'/'{tone}' never uses {{keyword}}")
+        return problems
+
+
+def _check_fields(registry):
+    """Raise ``ValueError`` for any placeholder other than ``{keyword}``; it could never render."""
+    tables = [("default", registry.default)] + list(registry.templates.items())
+    for category, tones in tables:
+        for tone, lines in tones.items():
+            for line in lines:
+                for field in line.fields:
+                    if field is not None and field not in TEMPLATE_FIELDS:
+                        raise ValueError(
+                            f"'{category}'/'{tone}' uses unknown field {{{field}}} in {line.source!r}"
+                        )
+
+
+def load_registry(path):
+    """Read a templates file and compile it into a ``TemplateRegistry``.
+
+    Raises ``ValueError`` if a template uses a field other than ``{keyword}``,
+    so a reload keeps serving the previous registry.
+    """
+    with open(path, encoding="utf-8") as f:
+        doc = json.load(f)
+    registry = TemplateRegistry(
+        doc["rewrite_templates"], doc["default_template"], doc["category_keywords"],
+        doc.get("category_aliases"),
+    )
+    _check_fields(registry)
+    registry.version = f"{doc.get('version', 0)}-{registry.version}"
+    for problem in registry.validate():
+        logger.warning("%s: %s", path, problem)
+    return registry
+
+
+# --- Shared instance ---
+_registry = None
+_source = None  # (path, mtime) the current registry was loaded from
+_next_check = 0.0
+_lock = threading.Lock()
+
+
+def templates_path():
+    return os.environ.get("SELLSPARK_TEMPLATES", DEFAULT_PATH)
+
+
+def reload_registry(force=False):
+    """Reload the templates file if it changed (or ``force``); return the registry."""
+    global _registry, _source
+    path = templates_path()
+    with _lock:
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError as e:
+            if _registry is None:
+                raise
+            logger.warning("Templates file unavailable, keeping version %s: %s", _registry.version, e)
+            return _registry
+        if force or _registry is None or _source != (path, mtime):
+            try:
+                fresh = load_registry(path)
+            except (OSError, ValueError, KeyError, TypeError) as e:
+                if _registry is None:
+                    raise
+                logger.warning("Could not reload %s, keeping version %s: %s", path, _registry.version, e)
+            else:
+                _registry = fresh
+                logger.info("Loaded templates %s from %s", fresh.version, path)
+            _source = (path, mtime)
+    return _registry
+
+
+def get_registry():
+    """Return the process-wide registry, reloading it if the file changed."""
+    global _next_check
+    now = time.monotonic()
+    if _registry is None or now >= _next_check:
+        _next_check = now + RELOAD_INTERVAL
+        return reload_registry()
+    return _registry
@@ -0,0 +1,232 @@
+"""Model-backed rewrites for Premium mode, with the template copy as fallback.
+
+A rewriter turns ``(listing, tone, category, draft)`` requests into rewritten
+copy, returning ``None`` for any request it could not serve; the engine then
+keeps the template draft. ``HttpRewriter`` talks to a text-generation endpoint
+(Hugging Face Inference API style: ``{"inputs": [...]}`` in,
+``[{"generated_text": ...}, ...]`` out). Each rewriter runs one asyncio loop
+on a background thread with one ``MicroBatcher``, shared by every caller in
+the process: requests from concurrent sessions and API threads are collected
+into the same micro-batches, and at most ``concurrency`` batches are in flight
+process-wide. A batch that errors or exceeds ``timeout`` falls back as a whole.
+
+The backend is configured with ``SELLSPARK_REWRITE_URL`` (plus ``HF_TOKEN``
+for auth), ``SELLSPARK_LOCAL_MODEL`` for a local CPU model (see
+``models.LocalRewriter``) or ``set_rewriter``; without one, Premium mode is
+template-only.
+"""
+
+# --- Imports ---
+import asyncio
+import atexit
+import json
+import logging
+import os
+import threading
+import urllib.request
+
+log = logging.getLogger(__name__)
+
+MAX_BATCH = 16
+MAX_WAIT = 0.01  # seconds a partial batch waits for more requests
+MAX_CONCURRENCY = 4
+TIMEOUT = 10.0
+
+
+def build_prompt(listing, tone, category, draft):
+    """Instruction sent to the model for one listing × tone."""
+    return (
+        f"Rewrite this {category} product listing in a {tone.lower()} tone for an online store.\n"
+        f"Listing: {listing}\n"
+        f"Draft: {draft}\n"
+        f"Rewrite:"
+    )
+
+
+def _generated_text(item):
+    if isinstance(item, list):
+        item = item[0] if item else None
+    if isinstance(item, dict):
+        item = item.get("generated_text")
+    if not isinstance(item, str) or not item.strip():
+        return None
+    return item.strip()
+
+
+class MicroBatcher:
+    """Group single awaitable requests into batches for ``send_batch``.
+
+    ``send_batch`` is a coroutine function taking a list of prompts and
+    returning one output (or ``None``) per prompt. Create the batcher inside
+    the event loop that will use it.
+    """
+
+    def __init__(self, send_batch, max_batch=MAX_BATCH, max_wait=MAX_WAIT,
+                 concurrency=MAX_CONCURRENCY, timeout=TIMEOUT):
+        self.send_batch = send_batch
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.timeout = timeout
+        self._queue = asyncio.Queue()
+        self._slots = asyncio.Semaphore(concurrency)
+        self._inflight = set()
+        self._worker = asyncio.ensure_future(self._collect())
+
+    async def submit(self, prompt):
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((prompt, future))
+        return await future
+
+    async def _collect(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.max_batch:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+            await self._slots.acquire()
+            task = asyncio.ensure_future(self._dispatch(batch))
+            self._inflight.add(task)
+            task.add_done_callback(self._inflight.discard)
+
+    async def _dispatch(self, batch):
+        prompts = [prompt for prompt, _ in batch]
+        try:
+            outputs = await asyncio.wait_for(self.send_batch(prompts), self.timeout)
+        except Exception as e:  # any backend failure means template fallback
+            log.warning("Rewrite batch of %d failed: %r", len(batch), e)
+            outputs = [None] * len(batch)
+        finally:
+            self._slots.release()
+        for (_, future), output in zip(batch, outputs):
+            if not future.done():
+                future.set_result(output)
+
+    async def close(self):
+        self._worker.cancel()
+        for task in list(self._inflight):
+            task.cancel()
+        await asyncio.gather(self._worker, *self._inflight, return_exceptions=True)
+
+
+class HttpRewriter:
+    """Rewrite backend for an HTTP text-generation endpoint.
+
+    The loop thread and batcher start on first use (and again in a forked
+    child, which doesn't inherit the thread); ``close`` stops them.
+    """
+
+    def __init__(self, url, token=None, max_batch=MAX_BATCH, max_wait=MAX_WAIT,
+                 concurrency=MAX_CONCURRENCY, timeout=TIMEOUT, max_new_tokens=120):
+        self.url = url
+        self.token = token
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.max_new_tokens = max_new_tokens
+        self._lock = threading.Lock()
+        self._loop = None
+        self._batcher = None
+        self._pid = None
+        atexit.register(self.close)
+
+    @property
+    def name(self):
+        return f"http:{self.url}"
+
+    def _post(self, prompts):
+        body = json.dumps({
+            "inputs": prompts,
+            "parameters": {"max_new_tokens": self.max_new_tokens, "return_full_text": False},
+        }).encode("utf-8")
+        request = urllib.request.Request(self.url, data=body, method="POST")
+        request.add_header("Content-Type", "application/json")
+        if self.token:
+            request.add_header("Authorization", f"Bearer {self.token}")
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            data = json.load(response)
+        if not isinstance(data, list) or len(data) != len(prompts):
+            raise ValueError(f"expected {len(prompts)} outputs, got {type(data).__name__}")
+        return [_generated_text(item) for item in data]
+
+    async def _send(self, prompts):
+        return await asyncio.to_thread(self._post, prompts)
+
+    def _ensure_loop(self):
+        with self._lock:
+            if self._loop is None or self._pid != os.getpid():
+                loop = asyncio.new_event_loop()
+                threading.Thread(
+                    target=loop.run_forever, name="sellspark-rewrite", daemon=True
+                ).start()
+                self._loop, self._pid = loop, os.getpid()
+                self._batcher = asyncio.run_coroutine_threadsafe(self._new_batcher(), loop).result()
+            return self._loop
+
+    async def _new_batcher(self):
+        return MicroBatcher(self._send, self.max_batch, self.max_wait, self.concurrency, self.timeout)
+
+    async def _submit_all(self, prompts):
+        return await asyncio.gather(*(self._batcher.submit(prompt) for prompt in prompts))
+
+    def _schedule(self, requests):
+        loop = self._ensure_loop()
+        prompts = [build_prompt(*request) for request in requests]
+        return asyncio.run_coroutine_threadsafe(self._submit_all(prompts), loop)
+
+    async def arewrite_many(self, requests):
+        """Rewrite ``(listing, tone, category, draft)`` requests; ``None`` where it failed."""
+        if not requests:
+            return []
+        return await asyncio.wrap_future(self._schedule(list(requests)))
+
+    def rewrite_many(self, requests):
+        """Blocking version of ``arewrite_many`` usable from sync code and any thread."""
+        if not requests:
+            return []
+        return self._schedule(list(requests)).result()
+
+    def close(self):
+        """Stop the loop thread; a later call starts a new one."""
+        with self._lock:
+            loop, self._loop = self._loop, None
+            if loop is None or self._pid != os.getpid():
+                return
+            asyncio.run_coroutine_threadsafe(self._batcher.close(), loop).result()
+            loop.call_soon_threadsafe(loop.stop)
+
+
+# --- Active backend ---
+_rewriter = None
+_rewriter_loaded = False
+
+
+def get_rewriter():
+    """Return the backend configured in the environment, or ``None``."""
+    global _rewriter, _rewriter_loaded
+    if not _rewriter_loaded:
+        url = os.environ.get("SELLSPARK_REWRITE_URL")
+        local_model = os.environ.get("SELLSPARK_LOCAL_MODEL")
+        if url:
+            _rewriter = HttpRewriter(url, token=os.environ.get("HF_TOKEN"))
+        elif local_model:
+            from .models import LocalRewriter
+            _rewriter = LocalRewriter(local_model)
+        else:
+            _rewriter = None
+        _rewriter_loaded = True
+    return _rewriter
+
+
+def set_rewriter(rewriter):
+    """Use ``rewriter`` (or ``None`` for template-only Premium) from now on."""
+    global _rewriter, _rewriter_loaded
+    _rewriter = rewriter
+    _rewriter_loaded = True
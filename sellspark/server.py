@@ -0,0 +1,298 @@
+"""Batch HTTP API over the listing engine (stdlib only).
+
+Endpoints (all ``POST`` with JSON bodies unless noted):
+
+* ``/optimize`` – full results (category, scores, tones, keywords);
+* ``/categorize`` – category and ranked scores;
+* ``/keywords`` – ranked keywords plus the SEO keyword string;
+* ``/batch?op=optimize|categorize|keywords`` – NDJSON in, NDJSON out,
+  streamed: input lines are processed a chunk at a time and each result line
+  is written as soon as its chunk is done;
+* ``GET /health`` and ``GET /metrics`` (Prometheus text).
+
+The first three accept one listing (``{"listing": "..."}`` or a bare string)
+and answer with one object, or a JSON array (of strings or objects) and
+answer with an array in the same order. ``mode`` and ``tones`` may be given
+in the body or the query string. Connections are HTTP/1.1 keep-alive, so
+clients can reuse one socket for many requests.
+
+    python -m sellspark --serve 8000
+    curl -s localhost:8000/optimize -d '{"listing": "Cotton shirt", "tones": ["Casual"]}'
+    jq -R . listings.txt | curl -s -X POST -T - 'localhost:8000/batch?op=categorize'
+"""
+
+# --- Imports ---
+import json
+import logging
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from .engine import TONES, classify, extract_keywords, process_chunk, rank_keywords
+from .feeds import CHUNK_SIZE, chunked
+from .metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE
+from .metrics import render_metrics
+
+log = logging.getLogger(__name__)
+
+MODES = ("Fast", "Premium")
+MAX_BODY = 64 * 2**20  # largest non-streaming request body, in bytes
+
+
+class BadRequest(ValueError):
+    """A client error, answered with HTTP 400."""
+
+
+# --- Operations: listings in, JSON-ready dicts out ---
+def _optimize(listings, options):
+    return process_chunk(listings, options["mode"], None, options["tones"])
+
+
+def _categorize(listings, options):
+    results = []
+    for listing in listings:
+        ranked = classify(listing)
+        results.append({
+            "listing": listing,
+            "category": ranked[0][0] if ranked else "General",
+            "category_scores": ranked,
+        })
+    return results
+
+
+def _keywords(listings, options):
+    return [
+        {"listing": listing, "keywords": rank_keywords(listing), "seo": extract_keywords(listing)}
+        for listing in listings
+    ]
+
+
+OPERATIONS = {"optimize": _optimize, "categorize": _categorize, "keywords": _keywords}
+
+
+def _listing_of(item):
+    if isinstance(item, str):
+        listing = item
+    elif isinstance(item, dict) and isinstance(item.get("listing"), str):
+        listing = item["listing"]
+    else:
+        raise BadRequest('each listing must be a string or an object with a "listing" string')
+    listing = listing.strip()
+    if not listing:
+        raise BadRequest("listings must not be empty")
+    return listing
+
+
+def _options(query, body=None):
+    """Merge ``mode``/``tones`` from the query string and a JSON object body."""
+    body = body if isinstance(body, dict) else {}
+    mode = body.get("mode") or query.get("mode", ["Fast"])[0]
+    tones = body.get("tones") or [
+        tone for value in query.get("tones", []) for tone in value.split(",") if tone
+    ]
+    if mode not in MODES:
+        raise BadRequest(f"mode must be one of {', '.join(MODES)}")
+    if isinstance(tones, str):
+        tones = [tones]
+    if not isinstance(tones, list):
+        raise BadRequest("tones must be a list of tone names")
+    unknown = [tone for tone in tones if tone not in TONES]
+    if unknown:
+        raise BadRequest(f"unknown tone(s): {', '.join(map(str, unknown))}")
+    return {"mode": mode, "tones": tones or None}
+
+
+class ApiHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "SellSpark"
+
+    # --- Plumbing ---
+    def _send(self, status, body, content_type="application/json"):
+        data = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _send_json(self, status, payload):
+        self._send(status, json.dumps(payload, ensure_ascii=False))
+
+    def _read_body(self):
+        if self.headers.get("Transfer-Encoding", "").lower() == "chunked":
+            return b"".join(self._iter_chunks(limit=MAX_BODY))
+        length = self._content_length()
+        if length > MAX_BODY:
+            raise BadRequest(f"body larger than {MAX_BODY} bytes; use /batch to stream")
+        return self.rfile.read(length)
+
+    def _content_length(self):
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            raise BadRequest("malformed Content-Length") from None
+        if length < 0:
+            raise BadRequest("malformed Content-Length")
+        return length
+
+    def _iter_chunks(self, limit=None):
+        """Yield the pieces of a ``Transfer-Encoding: chunked`` request body.
+
+        With a ``limit``, a body growing past it raises ``BadRequest`` before
+        the offending chunk is read.
+        """
+        total = 0
+        while True:
+            try:
+                size = int(self.rfile.readline().split(b";")[0].strip() or b"0", 16)
+            except ValueError:
+                raise BadRequest("malformed chunked body") from None
+            if size < 0:
+                raise BadRequest("malformed chunked body")
+            total += size
+            if limit is not None and total > limit:
+                raise BadRequest(f"body larger than {limit} bytes; use /batch to stream")
+            if size == 0:
+                while self.rfile.readline() not in (b"\r\n", b"\n", b""):
+                    pass  # trailers
+                return
+            yield self.rfile.read(size)
+            self.rfile.readline()
+
+    def _iter_body_lines(self):
+        """Yield request body lines without reading the whole body first."""
+        if self.headers.get("Transfer-Encoding", "").lower() == "chunked":
+            pending = b""
+            for piece in self._iter_chunks():
+                pending += piece
+                *lines, pending = pending.split(b"\n")
+                yield from lines
+            if pending:
+                yield pending
+            return
+        remaining = self._content_length()
+        while remaining > 0:
+            line = self.rfile.readline(min(remaining, 2**20))
+            if not line:
+                break
+            remaining -= len(line)
+            yield line
+
+    def log_message(self, fmt, *args):
+        log.debug("%s - %s", self.address_string(), fmt % args)
+
+    # --- Routes ---
+    def do_GET(self):
+        path = urlsplit(self.path).path
+        if path == "/health":
+            self._send_json(200, {"status": "ok"})
+        elif path == "/metrics":
+            self._send(200, render_metrics(), METRICS_CONTENT_TYPE)
+        else:
+            self._send_json(404, {"error": f"unknown path {path}"})
+
+    def do_POST(self):
+        url = urlsplit(self.path)
+        query = parse_qs(url.query)
+        op = url.path.strip("/")
+        try:
+            if op == "batch":
+                self._stream(query)
+            elif op in OPERATIONS:
+                self._answer(op, query)
+            else:
+                self._read_body()
+                self._send_json(404, {"error": f"unknown path {url.path}"})
+        except BadRequest as e:
+            self.close_connection = True  # the rest of the body may be unread
+            self._send_json(400, {"error": str(e)})
+        except Exception:
+            log.exception("Request to %s failed", url.path)
+            self.close_connection = True
+            self._send_json(500, {"error": "internal error"})
+
+    def _answer(self, op, query):
+        raw = self._read_body()
+        try:
+            body = json.loads(raw or b"null")
+        except ValueError as e:
+            raise BadRequest(f"invalid JSON: {e}") from None
+        if isinstance(body, dict) and isinstance(body.get("listings"), list):
+            items, single = body["listings"], False
+        elif isinstance(body, list):
+            items, single = body, False
+        elif body is not None:
+            items, single = [body], True
+        else:
+            raise BadRequest("send a listing, an array of listings or {\"listings\": [...]}")
+        options = _options(query, body)
+        listings = [_listing_of(item) for item in items]
+        run = OPERATIONS[op]
+        results = []
+        for chunk in chunked(listings, CHUNK_SIZE):
+            results.extend(run(chunk, options))
+        self._send_json(200, results[0] if single else results)
+
+    def _stream(self, query):
+        op = query.get("op", ["optimize"])[0]
+        if op not in OPERATIONS:
+            raise BadRequest(f"op must be one of {', '.join(OPERATIONS)}")
+        options = _options(query)
+        run = OPERATIONS[op]
+        lines = self._iter_body_lines()
+
+        def listings():
+            for number, raw in enumerate(lines, start=1):
+                raw = raw.strip()
+                if not raw:
+                    continue
+                try:
+                    yield _listing_of(json.loads(raw))
+                except ValueError as e:
+                    raise BadRequest(f"line {number}: {e}") from None
+
+        # Validate the first chunk before committing to a 200 response.
+        chunks = chunked(listings(), CHUNK_SIZE)
+        first = next(chunks, [])
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        try:
+            for chunk in ([first] if first else []):
+                self._write_chunk(run(chunk, options))
+            for chunk in chunks:
+                self._write_chunk(run(chunk, options))
+        except BadRequest as e:
+            self._write_chunk([{"error": str(e)}])
+            self.close_connection = True
+        except Exception:
+            # Headers are sent, so report in the stream rather than as a new response.
+            log.exception("Streaming /batch failed")
+            self._write_chunk([{"error": "internal error"}])
+            self.close_connection = True
+        self.wfile.write(b"0\r\n\r\n")
+
+    def _write_chunk(self, results):
+        data = "".join(json.dumps(result, ensure_ascii=False) + "\n" for result in results).encode("utf-8")
+        self.wfile.write(f"{len(data):x}\r\n".encode("ascii") + data + b"\r\n")
+        self.wfile.flush()
+
+
+def make_server(port=8000, host="127.0.0.1"):
+    """Create (but don't start) the API server."""
+    server = ThreadingHTTPServer((host, port), ApiHandler)
+    server.daemon_threads = True
+    return server
+
+
+def serve(port=8000, host="127.0.0.1"):
+    """Run the API server in the foreground until interrupted."""
+    server = make_server(port, host)
+    print(f"✅ SellSpark API on http://{host}:{server.server_port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
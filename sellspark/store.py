@@ -0,0 +1,94 @@
+"""SQLite store for finished batch results, keyed by batch id.
+
+A batch id is a hash of the listings, the mode, the pipeline version
+(templates, keyword index and rewrite backend) and the rendered tones, so
+re-running an identical batch (or reloading the page) reads the stored rows
+instead of re-running the pipeline. Only the most recent
+``MAX_BATCHES`` batches are kept.
+"""
+
+# --- Imports ---
+import hashlib
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+
+DEFAULT_PATH = os.path.join(tempfile.gettempdir(), "sellspark_results.db")
+MAX_BATCHES = 50
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS batches (
+    batch_id TEXT PRIMARY KEY,
+    created REAL NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS results (
+    batch_id TEXT NOT NULL,
+    idx INTEGER NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (batch_id, idx)
+);
+"""
+
+
+def batch_id(listings, mode, version, tones=None):
+    """Return a stable id for a batch of listings under a mode, pipeline version and tone subset."""
+    h = hashlib.blake2b(digest_size=12)
+    h.update(f"{mode}\0{version}\0".encode("utf-8"))
+    if tones:
+        h.update(f"{','.join(tones)}\0".encode("utf-8"))
+    for listing in listings:
+        h.update(listing.encode("utf-8"))
+        h.update(b"\n")
+    return h.hexdigest()
+
+
+class ResultStore:
+    """Thread-safe batch result store backed by a single SQLite file."""
+
+    def __init__(self, path=None):
+        self.path = path or os.environ.get("SELLSPARK_STORE_PATH", DEFAULT_PATH)
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+
+    def has(self, batch):
+        with self._lock:
+            row = self._db.execute("SELECT 1 FROM batches WHERE batch_id = ?", (batch,)).fetchone()
+        return row is not None
+
+    def save(self, batch, results):
+        """Store a finished batch, replacing any previous copy, and prune old ones."""
+        rows = [(batch, i, json.dumps(result, ensure_ascii=False)) for i, result in enumerate(results)]
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM results WHERE batch_id = ?", (batch,))
+            self._db.executemany("INSERT INTO results VALUES (?, ?, ?)", rows)
+            self._db.execute(
+                "INSERT OR REPLACE INTO batches VALUES (?, ?, ?)", (batch, time.time(), len(rows))
+            )
+            self._prune()
+
+    def _prune(self):
+        stale = self._db.execute(
+            "SELECT batch_id FROM batches ORDER BY created DESC LIMIT -1 OFFSET ?", (MAX_BATCHES,)
+        ).fetchall()
+        for (old,) in stale:
+            self._db.execute("DELETE FROM results WHERE batch_id = ?", (old,))
+            self._db.execute("DELETE FROM batches WHERE batch_id = ?", (old,))
+
+    def load(self, batch, offset=0, limit=-1):
+        """Return stored results for a batch (optionally one slice), or ``None``."""
+        if not self.has(batch):
+            return None
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT data FROM results WHERE batch_id = ? ORDER BY idx LIMIT ? OFFSET ?",
+                (batch, limit, offset),
+            ).fetchall()
+        return [json.loads(data) for (data,) in rows]
+
+    def close(self):
+        self._db.close()
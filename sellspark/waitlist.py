@@ -0,0 +1,175 @@
+"""Waitlist signups persisted by a single background writer.
+
+``Waitlist.add`` normalizes and dedupes an email in memory and queues it; one
+writer thread drains the queue into SQLite (WAL mode) in batches, every
+``flush_interval`` seconds or once ``max_pending`` signups are waiting. Many
+concurrent sessions therefore share one connection and one transaction per
+batch instead of racing on a CSV file, and duplicates never reach the disk.
+
+A batch that can't be written (database locked, disk full) is retried a few
+times; if it still fails it is dropped and its emails are forgotten, so the
+same people can sign up again. Callers find out without waiting on the disk:
+a dropped email is no longer ``in`` the waitlist, and ``flush`` reports it.
+"""
+
+# --- Imports ---
+import atexit
+import csv
+import logging
+import os
+import queue
+import re
+import sqlite3
+import threading
+import time
+
+log = logging.getLogger(__name__)
+
+DEFAULT_PATH = "waitlist.db"
+FLUSH_INTERVAL = 1.0  # seconds
+MAX_PENDING = 100
+WRITE_ATTEMPTS = 3
+RETRY_DELAY = 0.5  # seconds between write attempts
+FLUSH_TIMEOUT = 10.0
+
+EMAIL_RE = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS signups (
+    email TEXT PRIMARY KEY,
+    created REAL NOT NULL
+);
+"""
+
+
+def normalize_email(email):
+    """Strip and lowercase an email; raise ``ValueError`` if it doesn't look like one."""
+    email = email.strip().lower()
+    if not EMAIL_RE.match(email):
+        raise ValueError(f"'{email}' is not a valid email address")
+    return email
+
+
+class Waitlist:
+    """Deduplicated, batched email waitlist backed by SQLite."""
+
+    def __init__(self, path=None, flush_interval=FLUSH_INTERVAL, max_pending=MAX_PENDING):
+        self.path = path or os.environ.get("SELLSPARK_WAITLIST_PATH", DEFAULT_PATH)
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(_SCHEMA)
+        self._known = {email for (email,) in self._db.execute("SELECT email FROM signups")}
+        self._lock = threading.Lock()
+        self._queue = queue.Queue()
+        self._closed = False
+        self._failures = 0  # batches dropped after WRITE_ATTEMPTS
+        self._writer = threading.Thread(target=self._drain, name="sellspark-waitlist", daemon=True)
+        self._writer.start()
+        atexit.register(self.close)
+
+    def add(self, email):
+        """Queue a signup; return False if the email is already on the list."""
+        email = normalize_email(email)
+        with self._lock:
+            if email in self._known:
+                return False
+            self._known.add(email)
+        self._queue.put((email, time.time()))
+        return True
+
+    def __contains__(self, email):
+        try:
+            return normalize_email(email) in self._known
+        except ValueError:
+            return False
+
+    def __len__(self):
+        return len(self._known)
+
+    def _drain(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            if isinstance(item, threading.Event):  # flush() with nothing pending
+                item.set()
+                continue
+            batch = [item]
+            deadline = time.monotonic() + self.flush_interval
+            stop = False
+            while len(batch) < self.max_pending:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                    break
+                if isinstance(item, threading.Event):  # flush(): write now
+                    batch.append(item)
+                    break
+                batch.append(item)
+            self._write(batch)
+            if stop:
+                return
+
+    def _write(self, batch):
+        rows = [item for item in batch if isinstance(item, tuple)]
+        try:
+            for attempt in range(1, WRITE_ATTEMPTS + 1):
+                try:
+                    if rows:
+                        with self._db:
+                            self._db.executemany("INSERT OR IGNORE INTO signups VALUES (?, ?)", rows)
+                    break
+                except Exception as e:  # locked, disk full, ...: the writer must survive
+                    if attempt == WRITE_ATTEMPTS:
+                        log.error("Dropping %d waitlist signup(s) after %d failed writes: %r", len(rows), attempt, e)
+                        with self._lock:
+                            self._known.difference_update(email for email, _ in rows)
+                            self._failures += 1
+                    else:
+                        time.sleep(RETRY_DELAY)
+        finally:
+            for item in batch:
+                if isinstance(item, threading.Event):
+                    item.set()
+
+    def flush(self, timeout=FLUSH_TIMEOUT):
+        """Block until everything queued so far is written.
+
+        Returns False if that took longer than ``timeout`` or a batch was
+        dropped meanwhile.
+        """
+        if self._closed:
+            return True
+        failures = self._failures
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout) and self._failures == failures
+
+    def import_csv(self, path):
+        """Add the emails from a legacy ``waitlist.csv``; returns how many were new."""
+        added = 0
+        with open(path, newline="", encoding="utf-8") as f:
+            for row in csv.reader(f):
+                if not row or row[0].strip().lower() == "email":
+                    continue
+                try:
+                    added += self.add(row[0])
+                except ValueError:
+                    continue
+        return added
+
+    def close(self):
+        if self._closed:
+            return
+        self._queue.put(None)
+        self._writer.join()
+        self._closed = True
+        self._db.close()